@@ -0,0 +1,87 @@
+import math
+import time
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+REVIEWS_VERSION_KEY = 'reviews:title:{}:version'
+REVIEWS_PAGE_KEY = 'reviews:title:{}:{}:{}'
+USER_VERSION_KEY = 'auth:user:{}:version'
+USER_KEY = 'auth:user:{}:{}'
+TABLE_VERSION_KEY = 'table:{}:version'
+
+
+def new_version():
+    return uuid4().hex, time.time()
+
+
+def version_cache():
+    return caches[settings.VERSION_CACHE]
+
+
+def get_version(key):
+    """Текущая версия (токен, время смены); при вытеснении выдаётся новая.
+
+    Токен случайный, а не счётчик: после вытеснения или истечения
+    версия не может совпасть со старой, и устаревшие записи не оживут.
+    """
+    versions = version_cache()
+    version = versions.get(key)
+    if version is None:
+        version = new_version()
+        versions.add(key, version, settings.VERSION_CACHE_TIMEOUT)
+        version = versions.get(key) or version
+    return version
+
+
+def bump_version(key):
+    """Делает недействительными все записи, построенные на версии key.
+
+    Версия меняется после коммита, чтобы параллельный запрос не положил
+    в кеш под новой версией ещё незафиксированное состояние.
+    """
+    transaction.on_commit(lambda: version_cache().set(
+        key, new_version(), settings.VERSION_CACHE_TIMEOUT
+    ))
+
+
+def bump_reviews_version(title_id):
+    bump_version(REVIEWS_VERSION_KEY.format(title_id))
+
+
+def reviews_page_key(title_id, request):
+    """Ключ страницы отзывов и время смены её версии."""
+    params = sorted(request.query_params.lists())
+    digest = md5(f'{request.get_host()}|{params}'.encode()).hexdigest()
+    token, changed = get_version(REVIEWS_VERSION_KEY.format(title_id))
+    return REVIEWS_PAGE_KEY.format(title_id, token, digest), changed
+
+
+def bump_user_version(user_id):
+    bump_version(USER_VERSION_KEY.format(user_id))
+
+
+def user_key(user_id):
+    return USER_KEY.format(
+        user_id, get_version(USER_VERSION_KEY.format(user_id))[0]
+    )
+
+
+def bump_table_version(table):
+    bump_version(TABLE_VERSION_KEY.format(table))
+
+
+def tables_etag(tables, request):
+    """Сильный ETag и Last-Modified ответа, зависящего от таблиц tables."""
+    versions = [get_version(TABLE_VERSION_KEY.format(table))
+                for table in tables]
+    tokens = '|'.join(token for token, _ in versions)
+    params = sorted(request.query_params.lists())
+    source = (f'{request.get_host()}{request.path}|{params}|'
+              f'{request.META.get("HTTP_ACCEPT", "")}|{tokens}')
+    etag = f'"{md5(source.encode()).hexdigest()}"'
+    last_modified = int(math.ceil(max(changed for _, changed in versions)))
+    return etag, last_modified
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_version_cache(app_configs, **kwargs):
+    """Версии кеша в памяти процесса не видны другим воркерам."""
+    backend = settings.CACHES[settings.VERSION_CACHE]['BACKEND']
+    if backend not in LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'Кеш версий VERSION_CACHE ({backend}) не общий для процессов: '
+        'другие воркеры до VERSION_CACHE_TIMEOUT секунд отдают '
+        'устаревшие ответы и 304.',
+        hint='Задайте SHARED_CACHE_DIR или настройте Memcached.',
+        id='api.W001',
+    )]
@@ -0,0 +1,114 @@
+"""Сериализаторы списков из строк .values().
+
+Для больших страниц обход полей ModelSerializer дороже самого запроса.
+Здесь ответ собирается прямо из словарей .values() со связанными
+полями из JOIN; результат совпадает с TitleSerializer, ReviewSerializer
+и CommentSerializer байт в байт, что проверяет тест на паритет.
+"""
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from reviews.models import SCORES, Genre, score_field
+
+DATETIME = serializers.DateTimeField()
+
+
+def datetime_value(value):
+    """Как DateTimeField.to_representation, без его накладных расходов."""
+    if value is None:
+        return None
+    if api_settings.DATETIME_FORMAT != ISO_8601 or timezone.is_naive(value):
+        return DATETIME.to_representation(value)
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class ValuesSerializer:
+    fields = ()
+
+    def values(self, queryset):
+        return queryset.prefetch_related(None).values(*self.fields)
+
+    def serialize(self, rows):
+        raise NotImplementedError
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    fields = ('id', 'score', 'text', 'author__username', 'pub_date')
+
+    def serialize(self, rows):
+        return [{
+            'id': row['id'],
+            'score': row['score'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'pub_date': datetime_value(row['pub_date']),
+        } for row in rows]
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    fields = ('id', 'author__username', 'review', 'text', 'pub_date')
+
+    def serialize(self, rows):
+        return [{
+            'id': row['id'],
+            'author': row['author__username'],
+            'review': row['review'],
+            'text': row['text'],
+            'pub_date': datetime_value(row['pub_date']),
+        } for row in rows]
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    stats_fields = [f'stats__{score_field(score)}' for score in SCORES]
+    fields = (
+        'id', 'name', 'year', 'description',
+        'rating', 'rating_sum', 'rating_count',
+        'category__name', 'category__slug',
+        'stats__count', 'stats__latest_pub_date', *stats_fields,
+    )
+
+    def genres(self, title_ids):
+        # Тот же запрос, что у prefetch_related('genre'): порядок жанров
+        # внутри произведения совпадает.
+        genres = {title_id: [] for title_id in title_ids}
+        rows = Genre.objects.filter(genre__in=title_ids).values_list(
+            'genre', 'name', 'slug'
+        )
+        for title_id, name, slug in rows:
+            genres[title_id].append({'name': name, 'slug': slug})
+        return genres
+
+    def serialize(self, rows):
+        genres = self.genres([row['id'] for row in rows])
+        result = []
+        for row in rows:
+            stats = None
+            if row['stats__count'] is not None:
+                stats = {
+                    'count': row['stats__count'],
+                    'histogram': {
+                        str(score): row[field]
+                        for score, field in zip(SCORES, self.stats_fields)
+                    },
+                    'latest_pub_date': datetime_value(
+                        row['stats__latest_pub_date']
+                    ),
+                }
+            result.append({
+                'id': row['id'],
+                'name': row['name'],
+                'year': row['year'],
+                'genre': genres[row['id']],
+                'category': None if row['category__slug'] is None else {
+                    'name': row['category__name'],
+                    'slug': row['category__slug'],
+                },
+                'description': row['description'],
+                'rating': row['rating'],
+                'stats': stats,
+            })
+        return result
@@ -1,5 +1,6 @@
 import django_filters
 from reviews.models import Genre, Title
+from reviews.search import get_title_search
 
 
 class GenreFilter(django_filters.FilterSet):
@@ -20,7 +21,11 @@ class TitleFilter(django_filters.FilterSet):
     name = django_filters.CharFilter(
         field_name='name', lookup_expr='icontains'
     )
+    q = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
         fields = ['name', 'category', 'genre', 'year']
+
+    def filter_search(self, queryset, name, value):
+        return get_title_search().search(queryset, value)
@@ -0,0 +1,47 @@
+import threading
+
+from reviews.models import Category, Genre
+from .cache import TABLE_VERSION_KEY, get_version
+
+
+class SlugRegistry:
+    """Таблица slug → id небольшой модели в памяти процесса.
+
+    Перечитывается целиком, когда меняется версия таблицы (её повышают
+    сигналы api.signals при записи); между записями slug разрешается
+    без обращений к базе.
+    """
+
+    def __init__(self, model, table):
+        self.model = model
+        self.table = table
+        self.lock = threading.Lock()
+        self.version = None
+        self.ids = {}
+
+    def __deepcopy__(self, memo):
+        # DRF копирует поля сериализатора вместе с аргументами, а реестр
+        # должен остаться общим.
+        return self
+
+    def load(self, version):
+        ids = dict(self.model.objects.values_list('slug', 'pk'))
+        with self.lock:
+            self.ids, self.version = ids, version
+
+    def get(self, slug):
+        version = get_version(TABLE_VERSION_KEY.format(self.table))[0]
+        if version != self.version:
+            self.load(version)
+        pk = self.ids.get(slug)
+        if pk is None:
+            # Запись из другого процесса, версия которой сюда ещё не дошла.
+            pk = (self.model.objects.filter(slug=slug)
+                  .values_list('pk', flat=True).first())
+            if pk is not None:
+                self.load(version)
+        return pk
+
+
+genres = SlugRegistry(Genre, 'genres')
+categories = SlugRegistry(Category, 'categories')
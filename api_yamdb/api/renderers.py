@@ -0,0 +1,45 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LINE_SEPARATORS = (
+    (b'\xe2\x80\xa8', b'\\u2028'),
+    (b'\xe2\x80\xa9', b'\\u2029'),
+)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Даты и время, Decimal, ленивые строки и прочие типы вне JSON
+    кодируются тем же encoder_class, что и у JSONRenderer, поэтому ответ
+    совпадает байт в байт. Ответы с отступами, с ensure_ascii, без
+    compact и всё, что orjson не кодирует (целые больше 64 бит,
+    нестроковые ключи), отдаются стандартному json. Числа с плавающей
+    точкой совпадают в диапазоне 1e-4 <= |x| < 1e16, за его пределами
+    orjson пишет экспоненту без знака «+» и ведущего нуля.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Как и JSONRenderer, экранируем U+2028 и U+2029: без этого JSON
+        # не является подмножеством JavaScript.
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
@@ -1,9 +1,21 @@
 from rest_framework import serializers
-from reviews.models import (Category, Genre, Title,
+
+from api_yamdb.metrics import serialization
+from reviews.models import (Category, Genre, Title, TitleStats,
                             User, Review, Comment)
 
+from .registry import categories, genres
+
+
+class ModelSerializer(serializers.ModelSerializer):
+    """ModelSerializer, вывод которого попадает в замер serialize."""
 
-class UserSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        with serialization():
+            return super().to_representation(instance)
+
+
+class UserSerializer(ModelSerializer):
     username = serializers.CharField(required=True)
     email = serializers.CharField(required=True)
     role = serializers.StringRelatedField(read_only=True)
@@ -20,7 +32,7 @@ class UserSerializer(serializers.ModelSerializer):
         return value
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(ModelSerializer):
 
     class Meta:
         model = User
@@ -34,7 +46,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         return value
 
 
-class SignupSerializer(serializers.ModelSerializer):
+class SignupSerializer(ModelSerializer):
 
     class Meta:
         model = User
@@ -62,28 +74,49 @@ class ConfirmationCodeSerializer(serializers.Serializer):
         fields = ('username', 'confirmation_code')
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(ModelSerializer):
 
     class Meta:
         fields = ('name', 'slug')
         model = Genre
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(ModelSerializer):
 
     class Meta:
         fields = ('name', 'slug')
         model = Category
 
 
-class GetTitleSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(
+class RegistrySlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который находит id по slug в SlugRegistry.
+
+    Возвращает несохранённый объект только с pk и slug: этого хватает
+    для внешнего ключа, связи many-to-many и вывода slug в ответе.
+    """
+
+    def __init__(self, registry, **kwargs):
+        self.registry = registry
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        pk = self.registry.get(data)
+        if pk is None:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=data)
+        return self.registry.model(pk=pk, slug=data)
+
+
+class GetTitleSerializer(ModelSerializer):
+    category = RegistrySlugRelatedField(
+        categories,
         queryset=Category.objects.all(),
-        slug_field='slug'
     )
-    genre = serializers.SlugRelatedField(
+    genre = RegistrySlugRelatedField(
+        genres,
         queryset=Genre.objects.all(),
-        slug_field='slug',
         many=True
     )
     rating = serializers.IntegerField(required=False, read_only=True)
@@ -95,19 +128,31 @@ class GetTitleSerializer(serializers.ModelSerializer):
         model = Title
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class TitleStatsSerializer(ModelSerializer):
+    histogram = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+
+    class Meta:
+        fields = ('count', 'histogram', 'latest_pub_date')
+        model = TitleStats
+
+
+class TitleSerializer(ModelSerializer):
     genre = GenreSerializer(many=True, read_only=False)
     category = CategorySerializer(many=False, required=False)
     rating = serializers.IntegerField(required=False, read_only=True)
+    stats = TitleStatsSerializer(read_only=True)
 
     class Meta:
         fields = (
             'id', 'name', 'year', 'genre', 'category', 'description', 'rating',
+            'stats',
         )
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
@@ -125,17 +170,32 @@ class ReviewSerializer(serializers.ModelSerializer):
         return value
 
     def validate(self, data):
-        title_id = self.context['view'].kwargs.get('title_id')
-        author = self.context.get('request').user
-        if (Review.objects.filter(author=author, title=title_id).exists()
-           and self.context.get('request').method == 'POST'):
+        request = self.context['request']
+        if request.method != 'POST':
+            return data
+        title = self.context['view'].title
+        if Review.objects.filter(author=request.user, title=title).exists():
             raise serializers.ValidationError(
                 'На одно произведение можно оставлять только один отзыв!'
             )
         return data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class ReviewBatchItemSerializer(serializers.Serializer):
+    # Больший id не помещается в INTEGER базы.
+    title = serializers.IntegerField(min_value=1, max_value=2 ** 63 - 1)
+    text = serializers.CharField()
+    score = serializers.IntegerField()
+
+    def validate_score(self, value):
+        if not (0 < value <= 10):
+            raise serializers.ValidationError(
+                'Рейтинг должен быть целым числом от 0 до 10!'
+            )
+        return value
+
+
+class CommentSerializer(ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True, slug_field='username'
     )
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Category, Genre, Review, Title, TitleGenre
+from .cache import (bump_reviews_version, bump_table_version,
+                    bump_user_version)
+
+User = get_user_model()
+
+# Таблицы, от которых зависят ответы с ETag: рейтинг произведения
+# меняется вместе с отзывами, жанры привязаны через TitleGenre.
+TABLES = {
+    Title: 'titles',
+    TitleGenre: 'titles',
+    Review: 'titles',
+    Genre: 'genres',
+    Category: 'categories',
+}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    bump_user_version(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_reviews(sender, instance, created, raw=False, **kwargs):
+    # Страницы отзывов показывают имя автора.
+    if created or raw:
+        return
+    titles = (Review.objects.filter(author=instance)
+              .values_list('title_id', flat=True).distinct())
+    for title_id in titles:
+        bump_reviews_version(title_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_reviews(sender, instance, **kwargs):
+    # В том числе при каскадном удалении вместе с автором или произведением.
+    bump_reviews_version(instance.title_id)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_table(sender, **kwargs):
+    table = TABLES.get(sender)
+    if table is not None:
+        bump_table_version(table)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_table_version('titles')
+
+
+@receiver(post_delete, sender=Title)
+def invalidate_title_reviews(sender, instance, **kwargs):
+    bump_reviews_version(instance.pk)
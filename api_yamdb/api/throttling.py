@@ -0,0 +1,180 @@
+import math
+import threading
+import time
+from functools import lru_cache
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# Сколько ключей хранить в памяти, прежде чем выбросить полные вёдра
+MAX_KEYS = 10000
+
+
+def grant(tat, now, capacity, interval, tokens):
+    """Выдаёт до tokens токенов из ведра ёмкостью capacity.
+
+    Ведро хранится одним числом (GCRA): tat — момент, когда оно снова
+    станет полным. Возвращает (выдано токенов, новый tat).
+    """
+    tat = now if tat is None or tat < now else tat
+    available = math.floor((now + capacity * interval - tat) / interval
+                           + 1e-9)
+    granted = max(0, min(tokens, available))
+    return granted, tat + granted * interval
+
+
+class BucketStore:
+    """Хранилище вёдер токенов."""
+
+    def consume(self, key, capacity, interval):
+        raise NotImplementedError
+
+    def clear(self):
+        pass
+
+
+class LocalBucketStore(BucketStore):
+    """Вёдра в памяти процесса: для одного узла."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def consume(self, key, capacity, interval):
+        now = time.monotonic()
+        with self.lock:
+            granted, tat = grant(
+                self.buckets.get(key), now, capacity, interval, 1
+            )
+            if granted:
+                self.buckets[key] = tat
+                if len(self.buckets) > MAX_KEYS:
+                    self.buckets = {
+                        key: tat for key, tat in self.buckets.items()
+                        if tat > now
+                    }
+        return granted > 0
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+def lease_size(capacity):
+    """Сколько токенов узел забирает из общего ведра за раз."""
+    lease = math.ceil(capacity * settings.THROTTLE_LEASE)
+    return max(1, min(capacity, max(settings.THROTTLE_MIN_LEASE, lease)))
+
+
+class CacheBucketStore(BucketStore):
+    """Общие вёдра в кеше THROTTLE_CACHE для нескольких узлов.
+
+    С бэкендом DatabaseCache это таблица в базе. Узел забирает токены
+    пачкой (THROTTLE_LEASE — доля ёмкости ведра, но не меньше
+    THROTTLE_MIN_LEASE токенов) и расходует её в памяти, поэтому, пока
+    лимит не исчерпан, кеш читается и пишется раз на пачку, а не на каждый
+    запрос. Между чтением и записью ведра нет блокировки: при гонке узлов
+    лимит может быть превышен не больше чем на пачку на узел.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.leases = {}
+
+    def consume(self, key, capacity, interval):
+        now = time.time()
+        with self.lock:
+            left, expires = self.leases.get(key, (0, 0))
+            if left and expires > now:
+                self.leases[key] = (left - 1, expires)
+                return True
+        lease = lease_size(capacity)
+        cache = caches[settings.THROTTLE_CACHE]
+        granted, tat = grant(cache.get(key), now, capacity, interval, lease)
+        if not granted:
+            return False
+        cache.set(key, tat, math.ceil(tat - now) + 1)
+        with self.lock:
+            self.leases[key] = (granted - 1, now + capacity * interval)
+            if len(self.leases) > MAX_KEYS:
+                self.leases = {
+                    key: lease for key, lease in self.leases.items()
+                    if lease[1] > now
+                }
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.leases.clear()
+
+
+@lru_cache(maxsize=None)
+def get_bucket_store():
+    return import_string(settings.THROTTLE_STORE)()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Ведро токенов по значению из запроса; ёмкость и период — из rate.
+
+    Например, 5/min: пять запросов подряд, затем по одному каждые
+    12 секунд.
+    """
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_value(self, request):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        value = self.get_value(request)
+        if not value:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': md5(value.encode()).hexdigest(),
+        }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        return get_bucket_store().consume(
+            key, self.num_requests, self.duration / self.num_requests
+        )
+
+    def wait(self):
+        return self.duration / self.num_requests
+
+
+class IPThrottle(TokenBucketThrottle):
+    scope = 'auth_ip'
+
+    def get_value(self, request):
+        return self.get_ident(request)
+
+
+class FieldThrottle(TokenBucketThrottle):
+    field = None
+
+    def get_value(self, request):
+        data = request.data
+        if not hasattr(data, 'get'):
+            return None
+        return str(data.get(self.field) or '').strip().lower()
+
+
+class UsernameThrottle(FieldThrottle):
+    scope = 'auth_username'
+    field = 'username'
+
+
+class EmailThrottle(FieldThrottle):
+    scope = 'auth_email'
+    field = 'email'
@@ -1,8 +1,8 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 from api.views import (TitleViewSet, GenreViewSet, CategoryViewSet,
                        ReviewViewSet, CommentViewSet, UserViewSet,
-                       signup, get_token)
+                       signup, get_token, review_batch, export, metrics)
 
 
 v1_router = DefaultRouter()
@@ -27,6 +27,9 @@ auth = [
 ]
 
 urlpatterns = [
+    path('reviews/batch/', review_batch, name='review_batch'),
+    re_path(r'^_metrics/?$', metrics, name='metrics'),
+    re_path(r'^export/(?P<kind>reviews|comments)/$', export, name='export'),
     path('', include(v1_router.urls), name='api'),
     path('', include(auth)),
 ]
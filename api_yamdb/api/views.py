@@ -2,33 +2,54 @@ from rest_framework import viewsets, filters, status
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import (api_view, permission_classes, action,
+                                       throttle_classes)
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from django_filters.rest_framework import DjangoFilterBackend
 from django.shortcuts import get_object_or_404
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
 
-from reviews.models import (Category, Genre, Title,
+from api_yamdb.metrics import request_metrics
+from api_yamdb.replicas import caught_up, primary
+from reviews.models import (Category, Genre, Title, TitleStats,
                             User, Review)
+from reviews.export import export_lines, parse_since
+from reviews.mailqueue import enqueue_mail
+from reviews.services import (pending_scores, rebuild_title_stats,
+                              reviews_created, scores_snapshot)
 from .serializers import (CategorySerializer, GenreSerializer, UserSerializer,
                           ReviewSerializer, SignupSerializer, TitleSerializer,
                           ProfileSerializer, CommentSerializer,
-                          ConfirmationCodeSerializer, GetTitleSerializer)
+                          ConfirmationCodeSerializer, GetTitleSerializer,
+                          ReviewBatchItemSerializer, TitleStatsSerializer)
+from .cache import (bump_reviews_version, bump_table_version,
+                    reviews_page_key)
 from .filters import TitleFilter
+from .pagination import LimitOffsetOrKeysetPagination
+from .throttling import EmailThrottle, IPThrottle, UsernameThrottle
 from .permissions import Admin, ReadOnly, AuthorOrModeratorOrAdminOrReadOnly
-from .viewsets import CustomViewSet
+from .fast_serializers import (CommentValuesSerializer,
+                               ReviewValuesSerializer, TitleValuesSerializer)
+from .viewsets import (ConditionalGetMixin, CustomViewSet, FastListMixin,
+                       NestedResourceMixin)
 
 
 ADMIN_EMAIL = 'robot@yamdb-team.ru'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ConditionalGetMixin, FastListMixin,
+                   viewsets.ModelViewSet):
+    etag_tables = ('titles', 'genres', 'categories')
+    etag_actions = ('list', 'retrieve', 'stats')
+    fast_list_serializer = TitleValuesSerializer()
     queryset = (Title.objects.all()
-                .select_related('category')
-                .annotate(rating=Avg('reviews__score')))
+                .select_related('category', 'stats')
+                .prefetch_related('genre'))
     pagination_class = LimitOffsetPagination
     permission_classes = [Admin | ReadOnly]
     filter_backends = (DjangoFilterBackend, filters.SearchFilter)
@@ -41,8 +62,44 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleSerializer
         return GetTitleSerializer
 
-
-class GenreViewSet(CustomViewSet):
+    def list(self, request, *args, **kwargs):
+        with scores_snapshot():
+            return super().list(request, *args, **kwargs)
+
+    def prepare_rows(self, rows):
+        pending = pending_scores([row['id'] for row in rows])
+        for row in rows:
+            if row['id'] in pending:
+                pending[row['id']].add_to_row(row)
+        return rows
+
+    def retrieve(self, request, *args, **kwargs):
+        with scores_snapshot():
+            title = self.get_object()
+            pending = pending_scores([title.pk]).get(title.pk)
+            if pending is not None:
+                pending.add_to_title(title)
+            return Response(self.get_serializer(title).data)
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        with scores_snapshot():
+            title = get_object_or_404(Title, pk=pk)
+            stats = TitleStats.objects.filter(pk=title.pk).first()
+            if stats is None:
+                # Строка статистики потерялась: строится заново по отзывам
+                # основной базы.
+                with primary(), transaction.atomic():
+                    rebuild_title_stats([title.pk])
+                    stats = TitleStats.objects.get(pk=title.pk)
+            pending = pending_scores([stats.pk]).get(stats.pk)
+            if pending is not None:
+                pending.add_to_stats(stats)
+            return Response(TitleStatsSerializer(stats).data)
+
+
+class GenreViewSet(ConditionalGetMixin, CustomViewSet):
+    etag_tables = ('genres',)
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (Admin,)
@@ -60,7 +117,8 @@ class GenreViewSet(CustomViewSet):
         return super().get_permissions()
 
 
-class CategoryViewSet(CustomViewSet):
+class CategoryViewSet(ConditionalGetMixin, CustomViewSet):
+    etag_tables = ('categories',)
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (Admin,)
@@ -83,36 +141,54 @@ class CategoryViewSet(CustomViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(NestedResourceMixin, FastListMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    fast_list_serializer = ReviewValuesSerializer()
     permission_classes = (AuthorOrModeratorOrAdminOrReadOnly, )
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrKeysetPagination
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        return title.reviews.all()
+        return self.title.reviews.all()
+
+    def list(self, request, *args, **kwargs):
+        key, changed = reviews_page_key(self.kwargs.get('title_id'), request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        # Страница из реплики, которая могла не догнать версию, не
+        # кладётся под неё.
+        if caught_up(changed):
+            cache.set(key, response.data, settings.REVIEWS_CACHE_TIMEOUT)
+        return response
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        serializer.save(title=title, author=self.request.user)
+        # Рейтинг и кеш страниц обновляют сигналы отзыва.
+        with transaction.atomic():
+            serializer.save(title=self.title, author=self.request.user)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(NestedResourceMixin, FastListMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    fast_list_serializer = CommentValuesSerializer()
     permission_classes = (AuthorOrModeratorOrAdminOrReadOnly, )
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrKeysetPagination
 
     def get_queryset(self):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, pk=review_id)
-        return review.comments.all()
+        return self.review.comments.all()
 
     def perform_create(self, serializer):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, pk=review_id)
-        serializer.save(review=review, author=self.request.user)
+        serializer.save(review=self.review, author=self.request.user)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -131,8 +207,11 @@ class UserViewSet(viewsets.ModelViewSet):
     def me(self, request):
         serializer = UserSerializer(request.user)
         if request.method == 'PATCH':
+            # request.user может быть устаревшей копией из кеша
+            # аутентификации: сохраняется свежая запись из базы.
             serializer = UserSerializer(
-                request.user, data=request.data, partial=True
+                get_object_or_404(User, pk=request.user.pk),
+                data=request.data, partial=True
             )
             serializer.is_valid(raise_exception=True)
             serializer.save()
@@ -148,11 +227,12 @@ def send_confirmation_code(user):
     )
     admin_email = ADMIN_EMAIL
     user_email = [user.email]
-    return send_mail(subject, message, admin_email, user_email)
+    return enqueue_mail(subject, message, admin_email, user_email)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([IPThrottle, UsernameThrottle, EmailThrottle])
 def signup(request):
     serializer = SignupSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -165,6 +245,7 @@ def signup(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([IPThrottle, UsernameThrottle])
 def get_token(request):
     serializer = ConfirmationCodeSerializer(data=request.data)
     if not serializer.is_valid():
@@ -180,3 +261,133 @@ def get_token(request):
     return Response(
         {'token': str(token.access_token)}, status=status.HTTP_200_OK
     )
+
+
+DUPLICATE_REVIEW = {'non_field_errors': [
+    'На одно произведение можно оставлять только один отзыв!'
+]}
+
+
+def validate_batch(items):
+    """Проверяет поля каждого отзыва: результаты и (индекс, данные)."""
+    results = []
+    valid = []
+    for item in items:
+        serializer = ReviewBatchItemSerializer(data=item)
+        if serializer.is_valid():
+            results.append(None)
+            valid.append((len(results) - 1, serializer.validated_data))
+        else:
+            results.append({'status': 'error', 'errors': serializer.errors})
+    return results, valid
+
+
+def build_batch_reviews(user, valid, results):
+    """Отзывы к созданию; ошибки пишутся в results по индексу."""
+    title_ids = {data['title'] for _, data in valid}
+    existing = set(Title.objects.filter(
+        pk__in=title_ids).values_list('pk', flat=True))
+    reviewed = set(Review.objects.filter(
+        author=user, title_id__in=existing
+    ).values_list('title_id', flat=True))
+
+    reviews = []
+    for index, data in valid:
+        title_id = data['title']
+        if title_id not in existing:
+            results[index] = {'status': 'error', 'errors': {
+                'title': ['Произведение не найдено.']
+            }}
+        elif title_id in reviewed:
+            results[index] = {'status': 'error', 'errors': DUPLICATE_REVIEW}
+        else:
+            reviewed.add(title_id)
+            reviews.append((index, Review(
+                title_id=title_id, author=user,
+                text=data['text'], score=data['score'],
+            )))
+    return reviews
+
+
+def insert_batch_reviews(user, reviews):
+    """Вставляет отзывы одним запросом; возвращает их id по произведению."""
+    with transaction.atomic():
+        Review.objects.bulk_create(review for _, review in reviews)
+        created_ids = dict(Review.objects.filter(
+            author=user,
+            title_id__in=[review.title_id for _, review in reviews]
+        ).values_list('title_id', 'id'))
+        reviews_created(review for _, review in reviews)
+        for _, review in reviews:
+            bump_reviews_version(review.title_id)
+        bump_table_version('titles')
+    return created_ids
+
+
+def insert_batch(user, reviews, results):
+    try:
+        created_ids = insert_batch_reviews(user, reviews)
+    except IntegrityError:
+        # Параллельный POST успел создать отзыв на одно из произведений:
+        # отзывы вставляются по одному, дубликат становится ошибкой.
+        created_ids = {}
+        for index, review in reviews:
+            try:
+                created_ids.update(
+                    insert_batch_reviews(user, [(index, review)])
+                )
+            except IntegrityError:
+                results[index] = {
+                    'status': 'error', 'errors': DUPLICATE_REVIEW
+                }
+    for index, review in reviews:
+        if results[index] is None:
+            results[index] = {
+                'status': 'created',
+                'id': created_ids[review.title_id],
+                'title': review.title_id,
+            }
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def review_batch(request):
+    items = request.data
+    if not isinstance(items, list):
+        return Response(
+            {'detail': 'Ожидается список отзывов.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(items) > settings.REVIEW_BATCH_MAX_SIZE:
+        return Response(
+            {'detail': 'Слишком много отзывов в одном запросе: '
+                       f'не больше {settings.REVIEW_BATCH_MAX_SIZE}.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    results, valid = validate_batch(items)
+    reviews = build_batch_reviews(request.user, valid, results)
+    if reviews:
+        insert_batch(request.user, reviews, results)
+    return Response(results, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([Admin])
+def export(request, kind):
+    since = request.query_params.get('since')
+    if since:
+        try:
+            since = parse_since(since)
+        except ValueError as error:
+            return Response(
+                {'since': [str(error)]}, status=status.HTTP_400_BAD_REQUEST
+            )
+    return StreamingHttpResponse(
+        export_lines(kind, since), content_type='application/x-ndjson'
+    )
+
+
+@api_view(['GET'])
+@permission_classes([Admin])
+def metrics(request):
+    return Response(request_metrics.snapshot())
@@ -1,6 +1,16 @@
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import http_date
 from rest_framework import mixins
+from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from api_yamdb.metrics import serialization
+from api_yamdb.replicas import caught_up
+from reviews.models import Review, Title
+from .cache import tables_etag
+
 
 class CustomViewSet(
         mixins.CreateModelMixin,
@@ -8,3 +18,93 @@ class CustomViewSet(
         mixins.ListModelMixin,
         GenericViewSet):
     pass
+
+
+class ConditionalResponse(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """ETag и Last-Modified для действий etag_actions по версиям таблиц.
+
+    Проверка выполняется после аутентификации и прав доступа, но до
+    обработчика: при совпадении If-None-Match ответ 304 отдаётся без
+    выборки и сериализации данных.
+    """
+    etag_tables = ()
+    etag_actions = ('list', 'retrieve')
+    etag = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action not in self.etag_actions:
+            return
+        self.etag, self.last_modified = tables_etag(self.etag_tables, request)
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+        if response is not None:
+            raise ConditionalResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ConditionalResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        # Реплика могла ещё не догнать недавно сменившуюся версию и
+        # отдать старые данные: такой ответ не получает ETag.
+        if self.etag is not None and (
+                response.status_code == 304
+                or response.status_code == 200
+                and caught_up(self.last_modified)):
+            response['ETag'] = self.etag
+            response['Last-Modified'] = http_date(self.last_modified)
+        return response
+
+
+class NestedResourceMixin:
+    """Родительские объекты из URL, найденные один раз за запрос.
+
+    Отзыв выбирается вместе с произведением одним запросом и только если
+    принадлежит произведению из URL, иначе 404.
+    """
+
+    @cached_property
+    def title(self):
+        if 'review_id' in self.kwargs:
+            return self.review.title
+        return get_object_or_404(Title, pk=self.kwargs['title_id'])
+
+    @cached_property
+    def review(self):
+        return get_object_or_404(
+            Review.objects.select_related('title'),
+            pk=self.kwargs['review_id'],
+            title_id=self.kwargs['title_id'],
+        )
+
+
+class FastListMixin:
+    """list через fast_list_serializer: строки .values() вместо моделей."""
+    fast_list_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.fast_list_serializer.values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        rows = self.prepare_rows(page if page is not None else list(queryset))
+        with serialization():
+            data = self.fast_list_serializer.serialize(rows)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def prepare_rows(self, rows):
+        """Строки страницы перед сериализацией."""
+        return rows
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ApiYamdbConfig(AppConfig):
+    name = 'api_yamdb'
+
+    def ready(self):
+        from . import slowlog, sqlite  # noqa: F401
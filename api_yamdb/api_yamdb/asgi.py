@@ -3,13 +3,13 @@ ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+Django 2.2 has no ASGI support of its own, so the callable is the thread-pool
+adapter from ``api_yamdb.asgi_handler``.
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+from api_yamdb.asgi_handler import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
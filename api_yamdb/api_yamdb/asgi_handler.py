@@ -0,0 +1,182 @@
+import asyncio
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+
+
+class Disconnected(Exception):
+    """Ответ больше некому отправлять."""
+
+
+class ASGIHandler:
+    """ASGI-приложение поверх синхронного WSGIHandler.
+
+    В Django 2.2 нет асинхронных view и ORM, поэтому обработка запроса
+    уходит в пул из ASGI_THREADS потоков. Тело запроса читается и ответ
+    отправляется в цикле событий: медленный клиент держит соединение,
+    но не поток, и поток занят только на время работы view.
+    """
+    # Сколько частей ответа может ждать отправки клиенту
+    buffer_chunks = 8
+
+    def __init__(self, threads=None):
+        self.wsgi = WSGIHandler()
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads or settings.ASGI_THREADS,
+            thread_name_prefix='asgi',
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f'Неподдерживаемый тип соединения: '
+                             f'{scope["type"]}')
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.buffer_chunks)
+        closed = threading.Event()
+        worker = loop.run_in_executor(
+            self.executor, self.run, environ(scope, body), loop, queue,
+            closed
+        )
+        try:
+            await self.send_response(queue, send)
+        finally:
+            # Клиент отключился или ответ отправлен: поток пула не должен
+            # остаться ждать места в очереди.
+            closed.set()
+            while not queue.empty():
+                queue.get_nowait()
+        await worker
+
+    async def send_response(self, queue, send):
+        """Отправляет части ответа по мере того, как их отдаёт поток."""
+        start = await queue.get()
+        if start is None:
+            return
+        status, headers = start
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers,
+        })
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': True,
+            })
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        """Тело запроса или None, если клиент отключился."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    def run(self, environ, loop, queue, closed):
+        """Выполняет запрос в потоке пула и передаёт ответ по частям.
+
+        Первым в очередь идёт (статус, заголовки), затем части тела,
+        в конце None. Части потокового ответа (выгрузки) читают базу,
+        поэтому перебираются здесь же, в потоке запроса; очередь
+        ограничена, и медленный клиент притормаживает их выдачу.
+        """
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in headers
+            ]
+
+        def put(item):
+            if closed.is_set():
+                raise Disconnected
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        try:
+            result = self.wsgi(environ, start_response)
+            try:
+                put((started['status'], started['headers']))
+                for chunk in result:
+                    if chunk:
+                        put(chunk)
+            finally:
+                # request_finished закрывает соединения с базой этого потока
+                result.close()
+        except Disconnected:
+            pass
+        finally:
+            try:
+                put(None)
+            except Disconnected:
+                pass
+
+
+def environ(scope, body):
+    """WSGI environ для HTTP-соединения ASGI."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('127.0.0.1', 0)
+    result = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode().decode('latin1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name, value = name.decode('latin1'), value.decode('latin1')
+        if name == 'content-length':
+            continue
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        result[key] = f'{result[key]},{value}' if key in result else value
+    return result
+
+
+def get_asgi_application():
+    django.setup(set_prefix=False)
+    return ASGIHandler()
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, Max, Sum
+
+from api_yamdb.models import SlowQuery
+from api_yamdb.slowlog import buffer
+
+
+class Command(BaseCommand):
+    help = ('Сводка журнала медленных запросов: запросы одной формы '
+            'сгруппированы, сначала самые затратные по общему времени.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument(
+            '--clear', action='store_true', help='Очистить журнал.'
+        )
+
+    def handle(self, *args, **options):
+        buffer.flush()
+        if options['clear']:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(f'Удалено записей: {deleted}')
+            return
+        groups = list(
+            SlowQuery.objects.order_by().values('fingerprint').annotate(
+                count=Count('id'), total=Sum('duration'),
+                average=Avg('duration'), worst=Max('duration'),
+                latest=Max('id'),
+            ).order_by('-total')[:options['limit']]
+        )
+        if not groups:
+            self.stdout.write('Медленных запросов нет.')
+            return
+        samples = SlowQuery.objects.in_bulk(
+            [group['latest'] for group in groups]
+        )
+        for number, group in enumerate(groups, 1):
+            sample = samples[group['latest']]
+            views = sorted(set(
+                SlowQuery.objects.filter(fingerprint=group['fingerprint'])
+                .exclude(view='').values_list('view', flat=True)
+            ))
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{number}. {group["count"]} раз, всего '
+                f'{group["total"]:.1f} мс, в среднем {group["average"]:.1f} '
+                f'мс, максимум {group["worst"]:.1f} мс'
+            ))
+            self.stdout.write(f'   {sample.normalized}')
+            if views:
+                self.stdout.write(f'   view: {", ".join(views)}')
+            for line in sample.plan.splitlines():
+                self.stdout.write(f'   | {line}')
@@ -0,0 +1,191 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+# Верхние границы корзин гистограммы, мс
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+def percentile(ordered, share):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+class RequestMetrics:
+    """Последние window замеров по каждому действию view."""
+
+    def __init__(self, window):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, tag, sample):
+        with self.lock:
+            self.samples[tag].append(sample)
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def snapshot(self):
+        with self.lock:
+            samples = {tag: list(items) for tag, items in self.samples.items()}
+        return {
+            tag: self.summary(items) for tag, items in sorted(samples.items())
+        }
+
+    def summary(self, samples):
+        total = sorted(sample['total'] for sample in samples)
+        buckets = dict.fromkeys([*map(str, BUCKETS), 'inf'], 0)
+        for value in total:
+            bucket = next((str(bound) for bound in BUCKETS if value <= bound),
+                          'inf')
+            buckets[bucket] += 1
+        count = len(samples)
+        return {
+            'count': count,
+            'total_ms': {
+                'p50': percentile(total, 0.5),
+                'p95': percentile(total, 0.95),
+                'p99': percentile(total, 0.99),
+                'max': total[-1],
+            },
+            'mean_ms': {
+                name: round(sum(sample[name] for sample in samples) / count, 3)
+                for name in ('view', 'db', 'serialize', 'render')
+            },
+            'mean_queries': round(
+                sum(sample['queries'] for sample in samples) / count, 3
+            ),
+            'buckets': buckets,
+        }
+
+
+request_metrics = RequestMetrics(settings.REQUEST_METRICS_WINDOW)
+
+_current = threading.local()
+
+
+@contextmanager
+def serialization():
+    """Время блока идёт в замер serialize текущего запроса.
+
+    Вложенный блок (сериализатор внутри сериализатора) повторно
+    не считается.
+    """
+    timing = getattr(_current, 'timing', None)
+    if timing is None or timing.serializing:
+        yield
+        return
+    timing.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.serialize += time.perf_counter() - started
+        timing.serializing = False
+
+
+def view_tag(request, view_func):
+    """Имя вида ReviewViewSet.create: класс DRF-view и действие."""
+    cls = getattr(view_func, 'cls', None)
+    actions = getattr(view_func, 'actions', None)
+    method = request.method.lower()
+    if cls is None:
+        return view_func.__name__
+    if actions:
+        method = actions.get(method, method)
+    return f'{cls.__name__}.{method}'
+
+
+class Timing:
+
+    def __init__(self):
+        self.tag = 'unresolved'
+        self.queries = 0
+        self.db = 0.0
+        self.view_started = None
+        self.view = 0.0
+        self.serialize = 0.0
+        self.serializing = False
+        self.render_started = None
+        self.render = 0.0
+
+    def query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def view_finished(self):
+        if self.view_started is not None and not self.view:
+            self.view = time.perf_counter() - self.view_started
+
+    def rendered(self, response):
+        self.render = time.perf_counter() - self.render_started
+
+
+class RequestMetricsMiddleware:
+    """Число запросов к базе, время базы, view, сериализации и рендеринга.
+
+    Время view включает базу и сериализацию данных ответа, рендеринг
+    в JSON идёт после view.
+
+    Включается настройкой REQUEST_METRICS. Замеры уходят в заголовок
+    Server-Timing и в скользящую гистограмму /api/v1/_metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REQUEST_METRICS:
+            return self.get_response(request)
+        timing = request.timing = _current.timing = Timing()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(timing.query)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current.timing = None
+        total = time.perf_counter() - started
+        timing.view_finished()
+        sample = {
+            'total': round(total * 1000, 3),
+            'view': round(timing.view * 1000, 3),
+            'db': round(timing.db * 1000, 3),
+            'serialize': round(timing.serialize * 1000, 3),
+            'render': round(timing.render * 1000, 3),
+            'queries': timing.queries,
+        }
+        request_metrics.record(timing.tag, sample)
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={sample["db"]};desc="{timing.queries} queries"',
+            f'view;dur={sample["view"]}',
+            f'serialize;dur={sample["serialize"]}',
+            f'render;dur={sample["render"]}',
+            f'total;dur={sample["total"]}',
+        ))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = getattr(request, 'timing', None)
+        if timing is not None:
+            timing.tag = view_tag(request, view_func)
+            timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timing = getattr(request, 'timing', None)
+        if timing is not None:
+            timing.view_finished()
+            timing.render_started = time.perf_counter()
+            response.add_post_render_callback(timing.rendered)
+        return response
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата')),
+                ('database', models.CharField(max_length=64, verbose_name='База')),
+                ('view', models.CharField(blank=True, max_length=128, verbose_name='View')),
+                ('duration', models.FloatField(verbose_name='Длительность, мс')),
+                ('sql', models.TextField(verbose_name='SQL')),
+                ('params', models.TextField(blank=True, verbose_name='Параметры')),
+                ('fingerprint', models.CharField(db_index=True, max_length=32, verbose_name='Отпечаток')),
+                ('normalized', models.TextField(verbose_name='Обобщённый SQL')),
+                ('plan', models.TextField(blank=True, verbose_name='План')),
+            ],
+            options={
+                'verbose_name': 'Медленный запрос',
+                'verbose_name_plural': 'Медленные запросы',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    created = models.DateTimeField('Дата', auto_now_add=True)
+    database = models.CharField('База', max_length=64)
+    view = models.CharField('View', max_length=128, blank=True)
+    duration = models.FloatField('Длительность, мс')
+    sql = models.TextField('SQL')
+    params = models.TextField('Параметры', blank=True)
+    fingerprint = models.CharField('Отпечаток', max_length=32, db_index=True)
+    normalized = models.TextField('Обобщённый SQL')
+    plan = models.TextField('План', blank=True)
+
+    class Meta:
+        ordering = ['-id']
+        verbose_name = 'Медленный запрос'
+        verbose_name_plural = 'Медленные запросы'
+
+    def __str__(self):
+        return f'{self.duration:.1f} мс: {self.normalized[:80]}'
@@ -0,0 +1,174 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_KEY = 'replicas:pin:{}'
+
+_state = threading.local()
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+class RoundRobin:
+    """Реплики по очереди."""
+
+    def __init__(self):
+        self.counter = itertools.count()
+
+    def choose(self, aliases):
+        return aliases[next(self.counter) % len(aliases)]
+
+    def observe(self, alias, seconds):
+        pass
+
+
+class LeastLatency(RoundRobin):
+    """Реплика с наименьшим сглаженным временем запроса.
+
+    Каждый explore_every-й выбор делается по очереди, чтобы замеры
+    медленных реплик не устаревали.
+    """
+    weight = 0.2
+    explore_every = 10
+
+    def __init__(self):
+        super().__init__()
+        self.latency = {}
+        self.lock = threading.Lock()
+
+    def choose(self, aliases):
+        turn = next(self.counter)
+        if turn % self.explore_every == 0:
+            return aliases[turn // self.explore_every % len(aliases)]
+        return min(aliases, key=lambda alias: self.latency.get(alias, 0.0))
+
+    def observe(self, alias, seconds):
+        with self.lock:
+            old = self.latency.get(alias)
+            self.latency[alias] = (
+                seconds if old is None else old + self.weight * (seconds - old)
+            )
+
+
+SELECTORS = {
+    'round_robin': RoundRobin,
+    'least_latency': LeastLatency,
+}
+_selectors = {}
+
+
+def get_selector():
+    name = getattr(settings, 'DATABASE_REPLICA_SELECTION', 'round_robin')
+    if name not in _selectors:
+        _selectors[name] = SELECTORS[name]()
+    return _selectors[name]
+
+
+class ReplicaRouter:
+    """Чтение внутри безопасного запроса идёт в реплику, запись — в default.
+
+    Реплику на время запроса выбирает ReplicaMiddleware; вне запроса
+    и без настроенных реплик всё читается из default.
+    """
+
+    def db_for_read(self, model, **hints):
+        return getattr(_state, 'alias', None)
+
+    def db_for_write(self, model, **hints):
+        # Без явного ответа Django записал бы объект, прочитанный
+        # из реплики, обратно в неё.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+def reading_replica():
+    """Идёт ли чтение текущего запроса из реплики."""
+    return getattr(_state, 'alias', None) is not None
+
+
+def caught_up(changed):
+    """Видит ли чтение текущего запроса изменение, сделанное в changed.
+
+    Основная база видит всё, реплика — то, что старше
+    DATABASE_REPLICA_MAX_LAG секунд.
+    """
+    return (not reading_replica()
+            or time.time() - changed >= settings.DATABASE_REPLICA_MAX_LAG)
+
+
+@contextmanager
+def primary():
+    """Чтение из default внутри запроса, который идёт в реплику."""
+    alias = getattr(_state, 'alias', None)
+    _state.alias = None
+    try:
+        yield
+    finally:
+        _state.alias = alias
+
+
+def pin_key(request):
+    client = (request.META.get('HTTP_AUTHORIZATION')
+              or request.META.get('REMOTE_ADDR', ''))
+    return PIN_KEY.format(md5(client.encode()).hexdigest())
+
+
+class ReplicaMiddleware:
+    """Отправляет GET, HEAD и OPTIONS в реплики.
+
+    После записи клиент (по заголовку Authorization, без него — по IP)
+    DATABASE_REPLICA_PIN_SECONDS секунд читает из default, чтобы видеть
+    свои изменения, пока реплики догоняют. Отметка хранится в общем кеше
+    DATABASE_REPLICA_PIN_CACHE: следующий запрос может прийти в другой
+    воркер.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        aliases = replica_aliases()
+        if not aliases:
+            return self.get_response(request)
+        key = pin_key(request)
+        pins = caches[settings.DATABASE_REPLICA_PIN_CACHE]
+        if request.method in SAFE_METHODS and not pins.get(key):
+            return self.read(request, aliases)
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS:
+            pins.set(key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+        return response
+
+    def read(self, request, aliases):
+        selector = get_selector()
+        alias = selector.choose(aliases)
+
+        def timed(execute, sql, params, many, context):
+            started = time.monotonic()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                selector.observe(alias, time.monotonic() - started)
+
+        _state.alias = alias
+        try:
+            with connections[alias].execute_wrapper(timed):
+                return self.get_response(request)
+        finally:
+            del _state.alias
@@ -26,12 +26,15 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'reviews.apps.ReviewsConfig',
     'api.apps.ApiConfig',
-    'api_yamdb',
+    'api_yamdb.apps.ApiYamdbConfig',
     'django_filters',
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.replicas.ReplicaMiddleware',
+    'api_yamdb.slowlog.SlowQueryMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -61,6 +64,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
+ASGI_APPLICATION = 'api_yamdb.asgi.application'
+
+# Сколько потоков ASGI-приложения одновременно выполняют view
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 8))
+
 
 # Database
 
@@ -71,6 +79,144 @@ DATABASES = {
     }
 }
 
+# Реплики только для чтения: пути к файлам через запятую в DB_REPLICAS.
+# Синхронизация файлов с основной базой выполняется снаружи.
+DATABASE_REPLICAS = []
+for number, path in enumerate(
+        filter(None, os.environ.get('DB_REPLICAS', '').split(',')), 1):
+    DATABASES[f'replica{number}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': path,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+# Профили базы: production — постоянные соединения и настройки SQLite
+# для одновременной записи (WAL, меньше fsync, больше кеша)
+DB_PROFILES = {
+    'default': {
+        'CONN_MAX_AGE': 0,
+        'PRAGMAS': {},
+    },
+    'production': {
+        'CONN_MAX_AGE': int(os.environ.get('CONN_MAX_AGE', 600)),
+        'PRAGMAS': {
+            'journal_mode': 'wal',
+            'synchronous': 'normal',
+            'mmap_size': 256 * 1024 * 1024,
+            # Отрицательное значение — размер в КиБ, а не в страницах
+            'cache_size': -64 * 1024,
+            # Сколько мс ждать, пока другое соединение держит запись
+            'busy_timeout': 20000,
+        },
+    },
+}
+
+DB_PROFILE = os.environ.get('DB_PROFILE', 'default')
+
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = DB_PROFILES[DB_PROFILE]['CONN_MAX_AGE']
+
+# PRAGMA, которые выполняются при открытии каждого соединения SQLite
+SQLITE_PRAGMAS = DB_PROFILES[DB_PROFILE]['PRAGMAS']
+
+DATABASE_ROUTERS = ['api_yamdb.replicas.ReplicaRouter']
+
+# Выбор реплики: round_robin или least_latency
+DATABASE_REPLICA_SELECTION = 'round_robin'
+
+# За сколько секунд реплики гарантированно догоняют основную базу:
+# ответ из реплики получает ETag и кешируется, только если версии его
+# данных сменились раньше
+DATABASE_REPLICA_MAX_LAG = 5
+
+# Сколько секунд после записи клиент читает из основной базы
+DATABASE_REPLICA_PIN_SECONDS = DATABASE_REPLICA_MAX_LAG
+
+# Кеш, где хранится эта отметка; общий для всех воркеров
+DATABASE_REPLICA_PIN_CACHE = 'shared'
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
+    },
+    # Общий для всех процессов кеш версий, см. api.cache. Каталог
+    # SHARED_CACHE_DIR делят воркеры одного узла; для нескольких узлов
+    # нужен Memcached.
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb_shared',
+    } if not os.environ.get('SHARED_CACHE_DIR') else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ['SHARED_CACHE_DIR'],
+    },
+}
+
+# Кеш версий, которые делают недействительными ETag и закешированные
+# страницы; в нескольких процессах должен быть общим
+VERSION_CACHE = 'shared'
+
+# Время жизни версии, секунд: с кешем в памяти процесса столько
+# другие процессы могут не видеть изменения
+VERSION_CACHE_TIMEOUT = 60
+
+# Время жизни закешированных страниц отзывов, секунд
+REVIEWS_CACHE_TIMEOUT = 300
+
+# Время жизни пользователя в кеше JWT-аутентификации, секунд
+AUTH_USER_CACHE_TIMEOUT = 60
+
+
+# Reviews
+
+# Наибольшее число отзывов в одном запросе /reviews/batch/
+REVIEW_BATCH_MAX_SIZE = 5000
+
+# Отложенный пересчёт рейтингов (SCORE_WRITE_BEHIND=1): отзывы дописывают
+# изменения оценок в reviews_scoredelta, а manage.py fold_score_deltas
+# сворачивает их в рейтинги и статистику произведений
+SCORE_WRITE_BEHIND = os.environ.get('SCORE_WRITE_BEHIND') == '1'
+
+# Сколько изменений оценок сворачивать за одну транзакцию
+SCORE_FOLD_BATCH_SIZE = 1000
+
+
+# Outgoing mail queue
+
+# Число попыток доставки письма и задержка перед первым повтором, секунд;
+# каждая следующая задержка вдвое больше предыдущей
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+MAIL_QUEUE_RETRY_DELAY = 30
+
+
+# Request metrics
+
+# Замеры запросов: заголовок Server-Timing и /api/v1/_metrics
+REQUEST_METRICS = os.environ.get('REQUEST_METRICS') == '1'
+
+# Сколько последних замеров хранить по каждому действию view
+REQUEST_METRICS_WINDOW = 1000
+
+
+# Slow query log
+
+# Запросы дольше порога SLOW_QUERY_MS, мс, сохраняются с планом
+# выполнения; без переменной (или с пустой) журнал выключен
+SLOW_QUERY_THRESHOLD_MS = (
+    float(os.environ['SLOW_QUERY_MS'])
+    if os.environ.get('SLOW_QUERY_MS', '').strip() else None
+)
+
+# Сколько последних медленных запросов хранить
+SLOW_QUERY_LOG_SIZE = 1000
+
+# Как часто фоновый поток записывает накопленные запросы в журнал, секунд
+SLOW_QUERY_FLUSH_SECONDS = 5
+
 
 # Password validation
 
@@ -117,13 +263,38 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ],
+
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
 
     'PAGE_SIZE': 5,
+
+    # Вёдра токенов для регистрации и выдачи токена, см. api.throttling
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': '30/min',
+        'auth_username': '5/min',
+        'auth_email': '5/min',
+    },
 }
+
+# Хранилище вёдер: LocalBucketStore (один узел) или CacheBucketStore
+# (общий кеш THROTTLE_CACHE, например DatabaseCache, для нескольких узлов)
+THROTTLE_STORE = 'api.throttling.LocalBucketStore'
+THROTTLE_CACHE = 'default'
+
+# Доля ёмкости ведра, которую узел забирает из общего кеша за раз
+THROTTLE_LEASE = 0.2
+
+# Но не меньше стольких токенов: иначе маленькое ведро (5/min) читается
+# и пишется в кеш на каждый запрос. Цена — до пачки лишних запросов
+# на узел при гонке
+THROTTLE_MIN_LEASE = 2
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
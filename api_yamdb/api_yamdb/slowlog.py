@@ -0,0 +1,170 @@
+import re
+import threading
+import time
+from collections import deque
+from hashlib import md5
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.utils import ConnectionDoesNotExist
+from django.dispatch import receiver
+
+from .metrics import view_tag
+
+NORMALIZE = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'%s|\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+
+_state = threading.local()
+
+
+def normalize(sql):
+    """SQL без литералов и параметров: одинаков для запросов одной формы."""
+    for pattern, replacement in NORMALIZE:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(sql):
+    normalized = normalize(sql)
+    return md5(normalized.encode()).hexdigest(), normalized
+
+
+def explain(alias, sql, params):
+    if not EXPLAINABLE.match(sql):
+        return ''
+    try:
+        connection = connections[alias]
+        prefix = ('EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite'
+                  else 'EXPLAIN')
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+    except (ConnectionDoesNotExist, DatabaseError):
+        return ''
+
+
+class SlowQueryBuffer:
+    """Медленные запросы, ещё не записанные в журнал.
+
+    На пути запроса замер только добавляется в deque; EXPLAIN, вставка
+    и обрезка журнала до SLOW_QUERY_LOG_SIZE выполняются в фоновом
+    потоке раз в SLOW_QUERY_FLUSH_SECONDS секунд.
+    """
+
+    def __init__(self):
+        self.pending = deque()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def add(self, entry):
+        self.pending.append(entry)
+        while len(self.pending) > settings.SLOW_QUERY_LOG_SIZE:
+            self.pending.popleft()
+        if self.thread is None and settings.SLOW_QUERY_FLUSH_SECONDS:
+            self.start()
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self.run, name='slowlog', daemon=True
+                )
+                self.thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(settings.SLOW_QUERY_FLUSH_SECONDS or 1)
+            try:
+                self.flush()
+            finally:
+                connections.close_all()
+
+    def clear(self):
+        self.pending.clear()
+
+    def flush(self):
+        """Записывает накопленные запросы; возвращает их число."""
+        from .models import SlowQuery
+
+        entries = []
+        while self.pending:
+            entries.append(self.pending.popleft())
+        if not entries:
+            return 0
+        _state.recording = True
+        try:
+            with self.lock:
+                rows = []
+                for alias, view, duration, sql, params, many in entries:
+                    digest, normalized = fingerprint(sql)
+                    rows.append(SlowQuery(
+                        database=alias, view=view, duration=duration,
+                        sql=sql, params=repr(params)[:2000],
+                        fingerprint=digest, normalized=normalized,
+                        plan='' if many else explain(alias, sql, params),
+                    ))
+                with transaction.atomic():
+                    SlowQuery.objects.bulk_create(rows)
+                    last = SlowQuery.objects.order_by('-pk').values_list(
+                        'pk', flat=True
+                    ).first()
+                    SlowQuery.objects.filter(
+                        pk__lte=last - settings.SLOW_QUERY_LOG_SIZE
+                    ).delete()
+            return len(rows)
+        except DatabaseError:
+            return 0
+        finally:
+            _state.recording = False
+
+
+buffer = SlowQueryBuffer()
+
+
+def record(connection, sql, params, many, duration):
+    buffer.add((
+        connection.alias, getattr(_state, 'view', ''),
+        round(duration * 1000, 3), sql, params, many,
+    ))
+
+
+def capture(execute, sql, params, many, context):
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold is None or getattr(_state, 'recording', False):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started
+    if duration * 1000 >= threshold:
+        record(context['connection'], sql, params, many, duration)
+    return result
+
+
+@receiver(connection_created)
+def install_capture(sender, connection, **kwargs):
+    # В начало списка: execute_wrapper() снимает обёртки с конца, и
+    # соединение, открытое внутри такого блока, не должно потерять нашу.
+    if capture not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, capture)
+
+
+class SlowQueryMiddleware:
+    """Запоминает view запроса, чтобы указать его в журнале."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            _state.view = ''
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _state.view = view_tag(request, view_func)
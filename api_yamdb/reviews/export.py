@@ -0,0 +1,43 @@
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Comment, Review
+
+CHUNK_SIZE = 2000
+
+EXPORTS = {
+    'reviews': (Review, ('id', 'title_id', 'text', 'score', 'pub_date')),
+    'comments': (Comment, ('id', 'review_id', 'text', 'pub_date')),
+}
+
+
+def parse_since(value):
+    """Дата или дата со временем; наивное время считается локальным."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Неверная дата: {value}')
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def export_lines(kind, since=None, chunk_size=CHUNK_SIZE):
+    """NDJSON-строки без создания экземпляров моделей.
+
+    Строки читаются с сервера порциями по chunk_size, поэтому
+    потребление памяти не зависит от объёма выгрузки.
+    """
+    model, fields = EXPORTS[kind]
+    rows = model.objects.order_by('pk').values(*fields, 'author__username')
+    if since is not None:
+        rows = rows.filter(pub_date__gte=since)
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows.iterator(chunk_size=chunk_size):
+        row['author'] = row.pop('author__username')
+        yield encoder.encode(row) + '\n'
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import MAIL_FAILED, MAIL_PENDING, MAIL_SENT, OutgoingMail
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    """Ставит письма в очередь вместо отправки внутри запроса."""
+    return OutgoingMail.objects.bulk_create([
+        OutgoingMail(
+            subject=subject,
+            body=message,
+            from_email=from_email,
+            recipient=recipient,
+        )
+        for recipient in recipient_list
+    ])
+
+
+def pending_batch(batch_size):
+    return list(OutgoingMail.objects.filter(
+        status=MAIL_PENDING, send_after__lte=timezone.now()
+    )[:batch_size])
+
+
+def close(connection):
+    # Ошибка при закрытии не должна терять результаты отправки.
+    with suppress(Exception):
+        connection.close()
+
+
+def deliver(mails):
+    """Отправляет письма через одно соединение: (письмо, ошибка) на каждое."""
+    results = []
+    connection = get_connection()
+    try:
+        for mail in mails:
+            try:
+                connection.open()
+                EmailMessage(
+                    mail.subject, mail.body, mail.from_email,
+                    [mail.recipient], connection=connection,
+                ).send()
+            except Exception as error:
+                # Соединение могло оборваться: следующее письмо откроет
+                # новое.
+                close(connection)
+                results.append((mail, error))
+            else:
+                results.append((mail, None))
+    finally:
+        close(connection)
+    return results
+
+
+def record(results):
+    now = timezone.now()
+    sent = [mail.pk for mail, error in results if error is None]
+    OutgoingMail.objects.filter(pk__in=sent).update(
+        status=MAIL_SENT, sent_at=now, attempts=F('attempts') + 1
+    )
+    failed = 0
+    for mail, error in results:
+        if error is None:
+            continue
+        failed += 1
+        mail.attempts += 1
+        mail.last_error = repr(error)
+        if mail.attempts >= settings.MAIL_QUEUE_MAX_ATTEMPTS:
+            mail.status = MAIL_FAILED
+        else:
+            delay = settings.MAIL_QUEUE_RETRY_DELAY * 2 ** (mail.attempts - 1)
+            mail.send_after = now + timedelta(seconds=delay)
+        mail.save(update_fields=[
+            'attempts', 'last_error', 'status', 'send_after'
+        ])
+    return len(sent), failed
+
+
+def drain(batch_size=100, workers=4):
+    """Отправляет все готовые письма; возвращает (отправлено, ошибок).
+
+    Рассчитано на один процесс-обработчик: параллельность ограничена
+    пулом потоков внутри него. Каждый поток отправляет свою часть пачки
+    через одно соединение с почтовым сервером.
+    """
+    sent = failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batch = pending_batch(batch_size)
+        while batch:
+            chunks = [batch[start::workers] for start in range(workers)]
+            results = [
+                result
+                for chunk in pool.map(deliver, filter(None, chunks))
+                for result in chunk
+            ]
+            batch_sent, batch_failed = record(results)
+            sent += batch_sent
+            failed += batch_failed
+            if batch_sent == 0:
+                break
+            batch = pending_batch(batch_size)
+    return sent, failed
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.export import CHUNK_SIZE, EXPORTS, export_lines, parse_since
+
+
+class Command(BaseCommand):
+    help = 'Выгружает отзывы или комментарии в формате NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--since', help='Дата публикации не раньше.')
+        parser.add_argument('--output', help='Файл; по умолчанию stdout.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = parse_since(options['since'])
+            except ValueError as error:
+                raise CommandError(error)
+        lines = export_lines(options['kind'], since, options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            file.writelines(lines)
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError
+
+from reviews.services import fold_score_deltas
+
+
+# Сколько раз подряд повторять пачку, которую не удалось записать
+RETRIES = 5
+
+
+class Command(BaseCommand):
+    help = ('Сворачивает отложенные изменения оценок (SCORE_WRITE_BEHIND) '
+            'в рейтинги и статистику произведений. Запускается '
+            'в одном экземпляре.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.SCORE_FOLD_BATCH_SIZE
+        )
+        parser.add_argument('--interval', type=float, default=1.0)
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Свернуть накопленные изменения и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        failures = 0
+        while True:
+            try:
+                folded = fold_score_deltas(batch_size=options['batch_size'])
+            except OperationalError as error:
+                # Например, database is locked: пачка откатилась целиком
+                # и будет свёрнута при повторе.
+                failures += 1
+                if failures >= RETRIES:
+                    raise CommandError(
+                        f'Не удалось свернуть изменения: {error}'
+                    )
+                self.stderr.write(f'Повтор после ошибки: {error}')
+                time.sleep(options['interval'])
+                continue
+            failures = 0
+            if folded:
+                self.stdout.write(f'Свёрнуто изменений: {folded}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,193 @@
+import csv
+import os
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre, User)
+from reviews.search import get_title_search
+from reviews.services import rebuild_ratings, rebuild_title_stats
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+BATCH_SIZE = 5000
+
+
+class IdSet:
+    """Отсортированный массив первичных ключей: 8 байт на запись."""
+
+    def __init__(self, model):
+        self.ids = array('q', model.objects.order_by('pk').values_list(
+            'pk', flat=True
+        ).iterator(chunk_size=BATCH_SIZE))
+
+    def __contains__(self, value):
+        index = bisect_left(self.ids, value)
+        return index < len(self.ids) and self.ids[index] == value
+
+
+def read_rows(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        yield from csv.DictReader(file)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+@contextmanager
+def raw_dates(*models):
+    """Сохраняет pub_date из файла вместо подстановки auto_now_add."""
+    fields = [
+        field for model in models for field in model._meta.fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов static/data в базу данных.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=DATA_DIR)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        self.path = options['path']
+        self.batch_size = options['batch_size']
+        self.load('users.csv', User, self.users)
+        users = IdSet(User)
+        self.load('category.csv', Category, self.categories)
+        categories = IdSet(Category)
+        self.load('genre.csv', Genre, self.genres)
+        genres = IdSet(Genre)
+        self.load('titles.csv', Title, self.titles, categories)
+        get_title_search().rebuild()
+        titles = IdSet(Title)
+        self.load(
+            'genre_title.csv', TitleGenre, self.genre_titles, titles, genres
+        )
+        with raw_dates(Review, Comment):
+            self.load('review.csv', Review, self.reviews, titles, users)
+            del titles
+            reviews = IdSet(Review)
+            self.load('comments.csv', Comment, self.comments, reviews, users)
+        with transaction.atomic():
+            rebuild_ratings()
+            rebuild_title_stats()
+        self.reset_sequences()
+
+    def load(self, filename, model, build, *id_maps):
+        path = os.path.join(self.path, filename)
+        if not os.path.exists(path):
+            self.stdout.write(self.style.WARNING(f'{filename}: нет файла'))
+            return
+        loaded = skipped = 0
+        started = time.monotonic()
+        with transaction.atomic():
+            for rows in batched(read_rows(path), self.batch_size):
+                objs = [obj for obj in (build(row, *id_maps) for row in rows)
+                        if obj is not None]
+                model.objects.bulk_create(objs)
+                loaded += len(objs)
+                skipped += len(rows) - len(objs)
+        elapsed = time.monotonic() - started
+        rate = loaded / elapsed if elapsed else loaded
+        self.stdout.write(self.style.SUCCESS(
+            f'{filename}: {loaded} строк, пропущено {skipped}, '
+            f'{elapsed:.2f} с, {rate:.0f} строк/с'
+        ))
+
+    def reset_sequences(self):
+        models = [User, Category, Genre, Title, TitleGenre, Review, Comment]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    @staticmethod
+    def users(row):
+        return User(
+            pk=int(row['id']),
+            username=row['username'],
+            email=row['email'],
+            role=row['role'],
+            bio=row['bio'],
+            first_name=row['first_name'],
+            last_name=row['last_name'],
+            password=make_password(None),
+        )
+
+    @staticmethod
+    def categories(row):
+        return Category(pk=int(row['id']), name=row['name'], slug=row['slug'])
+
+    @staticmethod
+    def genres(row):
+        return Genre(pk=int(row['id']), name=row['name'], slug=row['slug'])
+
+    @staticmethod
+    def titles(row, categories):
+        category_id = int(row['category']) if row['category'] else None
+        if category_id is not None and category_id not in categories:
+            return None
+        return Title(
+            pk=int(row['id']),
+            name=row['name'],
+            year=int(row['year']),
+            description=row.get('description', ''),
+            category_id=category_id,
+        )
+
+    @staticmethod
+    def genre_titles(row, titles, genres):
+        title_id, genre_id = int(row['title_id']), int(row['genre_id'])
+        if title_id not in titles or genre_id not in genres:
+            return None
+        return TitleGenre(pk=int(row['id']), title_id=title_id,
+                          genre_id=genre_id)
+
+    @staticmethod
+    def reviews(row, titles, users):
+        title_id, author_id = int(row['title_id']), int(row['author'])
+        if title_id not in titles or author_id not in users:
+            return None
+        return Review(
+            pk=int(row['id']),
+            title_id=title_id,
+            author_id=author_id,
+            text=row['text'],
+            score=int(row['score']),
+            pub_date=parse_datetime(row['pub_date']),
+        )
+
+    @staticmethod
+    def comments(row, reviews, users):
+        review_id, author_id = int(row['review_id']), int(row['author'])
+        if review_id not in reviews or author_id not in users:
+            return None
+        return Comment(
+            pk=int(row['id']),
+            review_id=review_id,
+            author_id=author_id,
+            text=row['text'],
+            pub_date=parse_datetime(row['pub_date']),
+        )
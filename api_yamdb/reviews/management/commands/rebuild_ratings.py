@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.services import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые рейтинги всех произведений.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rated = rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Рейтинги пересчитаны, с оценками: {rated}')
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.services import rebuild_title_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает распределение оценок и число отзывов произведений.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            built = rebuild_title_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика пересчитана, произведений: {built}'
+        ))
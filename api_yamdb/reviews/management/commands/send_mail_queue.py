@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.mailqueue import drain
+
+
+class Command(BaseCommand):
+    help = ('Отправляет письма из очереди исходящей почты. '
+            'Запускается в одном экземпляре.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--interval', type=float, default=1.0)
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = drain(options['batch_size'], options['workers'])
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, с ошибкой: {failed}'
+                )
+            if options['once']:
+                return
+            time.sleep(options['interval'])
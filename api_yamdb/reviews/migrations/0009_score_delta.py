@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreDelta',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('delta', models.SmallIntegerField(verbose_name='Изменение числа оценок')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_deltas', to='reviews.Title')),
+            ],
+            options={
+                'verbose_name': 'Изменение оценок',
+                'verbose_name_plural': 'Изменения оценок',
+            },
+        ),
+    ]
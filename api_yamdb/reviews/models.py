@@ -2,6 +2,7 @@ from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
+from django.utils import timezone
 from datetime import datetime
 
 
@@ -18,6 +19,22 @@ ALPHANUMERIC = RegexValidator(
     r'^[0-9a-zA-Z]*$', 'Допустимы только буквы или цифры.'
 )
 REVIEW_TEXT_LENGTH = 15
+RATING_FIELDS = ('rating_sum', 'rating_count', 'rating')
+
+MAIL_PENDING = 'pending'
+MAIL_SENT = 'sent'
+MAIL_FAILED = 'failed'
+MAIL_STATUS_CHOICES = [
+    (MAIL_PENDING, 'В очереди'),
+    (MAIL_SENT, 'Отправлено'),
+    (MAIL_FAILED, 'Не доставлено'),
+]
+
+SCORES = range(1, 11)
+
+
+def score_field(score):
+    return f'score_{score}'
 
 
 class User(AbstractUser):
@@ -76,6 +93,11 @@ class Review(models.Model):
                 fields=["author", "title"], name="unique_review"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["title", "pub_date"], name="review_title_pub_date_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.text[:REVIEW_TEXT_LENGTH]
@@ -90,6 +112,14 @@ class Comment(models.Model):
     pub_date = models.DateTimeField(
         'Дата добавления', auto_now_add=True, db_index=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["review", "pub_date"],
+                name="comment_review_pub_date_idx"
+            ),
+        ]
+
 
 class Genre(models.Model):
     name = models.CharField(max_length=100)
@@ -117,6 +147,13 @@ class TitleGenre(models.Model):
         'Title', on_delete=models.CASCADE, related_name='titles'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["genre", "title"], name="titlegenre_genre_title_idx"
+            ),
+        ]
+
     def __str__(self):
         return f'{self.title} {self.genre}'
 
@@ -140,3 +177,109 @@ class Title(models.Model):
         related_name='category',
         on_delete=models.CASCADE,
     )
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0)
+    rating_count = models.PositiveIntegerField('Количество оценок', default=0)
+    rating = models.PositiveSmallIntegerField(
+        'Рейтинг', null=True, blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["category", "year"], name="title_category_year_idx"
+            ),
+            models.Index(fields=["year"], name="title_year_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Счётчики рейтинга меняются только запросами UPDATE с F():
+        # сохранение загруженного раньше объекта не должно затирать
+        # оценки, добавленные после его загрузки.
+        if (not self._state.adding and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in RATING_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class TitleStats(models.Model):
+    """Распределение оценок произведения, обновляется вместе с отзывами."""
+    title = models.OneToOneField(
+        Title, on_delete=models.CASCADE, primary_key=True,
+        related_name='stats'
+    )
+    score_1 = models.PositiveIntegerField('Оценок 1', default=0)
+    score_2 = models.PositiveIntegerField('Оценок 2', default=0)
+    score_3 = models.PositiveIntegerField('Оценок 3', default=0)
+    score_4 = models.PositiveIntegerField('Оценок 4', default=0)
+    score_5 = models.PositiveIntegerField('Оценок 5', default=0)
+    score_6 = models.PositiveIntegerField('Оценок 6', default=0)
+    score_7 = models.PositiveIntegerField('Оценок 7', default=0)
+    score_8 = models.PositiveIntegerField('Оценок 8', default=0)
+    score_9 = models.PositiveIntegerField('Оценок 9', default=0)
+    score_10 = models.PositiveIntegerField('Оценок 10', default=0)
+    count = models.PositiveIntegerField('Количество отзывов', default=0)
+    latest_pub_date = models.DateTimeField(
+        'Дата последнего отзыва', null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    @property
+    def histogram(self):
+        return {score: getattr(self, score_field(score)) for score in SCORES}
+
+
+class ScoreDelta(models.Model):
+    """Ещё не свёрнутое изменение оценок произведения.
+
+    Отзыв с оценкой score добавляет запись с delta=1, удаление — с
+    delta=-1, смена оценки — обе. Рейтинг и статистика произведения —
+    это свёрнутые значения плюс записи, которые ещё здесь.
+    """
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, related_name='score_deltas'
+    )
+    score = models.PositiveSmallIntegerField('Оценка')
+    delta = models.SmallIntegerField('Изменение числа оценок')
+
+    class Meta:
+        verbose_name = 'Изменение оценок'
+        verbose_name_plural = 'Изменения оценок'
+
+
+class OutgoingMail(models.Model):
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    recipient = models.EmailField('Получатель')
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=MAIL_STATUS_CHOICES,
+        default=MAIL_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Дата добавления', auto_now_add=True)
+    send_after = models.DateTimeField('Отправить после', default=timezone.now)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['status', 'send_after'],
+                name='mail_status_send_after_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
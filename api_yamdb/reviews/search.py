@@ -0,0 +1,126 @@
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'reviews_title_fts'
+WORD = re.compile(r'\w+')
+
+
+class TitleSearch:
+    """Полнотекстовый поиск по названию и описанию произведения."""
+
+    def index(self, title):
+        pass
+
+    def remove(self, title_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+
+class SQLiteFTS5TitleSearch(TitleSearch):
+    """Индекс FTS5, ранжирование bm25: совпадение в названии весит больше."""
+    rank_sql = (
+        f'SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = reviews_title.id'
+    )
+    # RawSQL внутри pk__in получает двойные скобки, и SQLite считает
+    # подзапрос скалярным, поэтому условие передаётся через extra().
+    match_sql = (
+        f'reviews_title.id IN (SELECT rowid FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s)'
+    )
+
+    def index(self, title):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                [title.pk, title.name, title.description]
+            )
+
+    def remove(self, title_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title_id]
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                'SELECT id, name, description FROM reviews_title'
+            )
+
+    def search(self, queryset, query):
+        words = WORD.findall(query)
+        if not words:
+            return queryset.none()
+        match = ' '.join(f'"{word}"*' for word in words)
+        return (queryset
+                .extra(where=[self.match_sql], params=[match])
+                .annotate(search_rank=RawSQL(self.rank_sql, [match]))
+                .order_by('search_rank', 'pk'))
+
+
+class PostgresTitleSearch(TitleSearch):
+    """tsvector на лету; для больших таблиц нужен GIN-индекс по выражению."""
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+
+        vector = (SearchVector('name', weight='A')
+                  + SearchVector('description', weight='B'))
+        search_query = SearchQuery(query)
+        return (queryset
+                .annotate(search_rank=SearchRank(vector, search_query))
+                .filter(search_rank__gt=0)
+                .order_by('-search_rank', 'pk'))
+
+
+class LikeTitleSearch(TitleSearch):
+    """Запасной вариант для прочих СУБД: все слова, сначала по названию."""
+
+    def search(self, queryset, query):
+        words = WORD.findall(query)
+        if not words:
+            return queryset.none()
+        in_name = Q()
+        for word in words:
+            in_name &= Q(name__icontains=word)
+            queryset = queryset.filter(
+                Q(name__icontains=word) | Q(description__icontains=word)
+            )
+        return queryset.annotate(search_rank=Case(
+            When(in_name, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )).order_by('search_rank', 'pk')
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTS5TitleSearch,
+    'postgresql': PostgresTitleSearch,
+}
+
+
+@lru_cache(maxsize=None)
+def get_title_search():
+    path = getattr(settings, 'TITLE_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return BACKENDS.get(connection.vendor, LikeTitleSearch)()
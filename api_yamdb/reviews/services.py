@@ -0,0 +1,303 @@
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import (Case, Count, DateTimeField, F, IntegerField,
+                              Max, OuterRef, Q, Subquery, Sum, Value, When)
+from django.db.models.functions import Coalesce
+
+from .models import (SCORES, Review, ScoreDelta, Title, TitleStats,
+                     score_field)
+
+
+def apply_score_delta(title_id, score_delta, count_delta):
+    """Сдвигает сохранённый рейтинг произведения одним UPDATE."""
+    new_count = F('rating_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=new_count,
+        rating=Case(
+            When(rating_count=-count_delta, then=Value(None)),
+            default=(F('rating_sum') + score_delta) / new_count,
+            output_field=IntegerField(),
+        ),
+    )
+
+
+def apply_stats_delta(title_id, **updates):
+    """Обновляет гистограмму одним UPDATE; нет строки — строит её заново."""
+    if not TitleStats.objects.filter(pk=title_id).update(**updates):
+        rebuild_title_stats([title_id])
+
+
+def shift(score, delta):
+    field = score_field(score)
+    return {field: F(field) + delta}
+
+
+def review_created(review):
+    if settings.SCORE_WRITE_BEHIND:
+        ScoreDelta.objects.create(
+            title_id=review.title_id, score=review.score, delta=1
+        )
+        return
+    apply_score_delta(review.title_id, review.score, 1)
+    apply_stats_delta(
+        review.title_id,
+        count=F('count') + 1,
+        latest_pub_date=Case(
+            When(latest_pub_date__gte=review.pub_date,
+                 then=F('latest_pub_date')),
+            default=Value(review.pub_date),
+            output_field=DateTimeField(),
+        ),
+        **shift(review.score, 1)
+    )
+
+
+def reviews_created(reviews):
+    title_ids = {review.title_id for review in reviews}
+    rebuild_ratings(title_ids)
+    rebuild_title_stats(title_ids)
+
+
+def review_updated(review, old_score):
+    if review.score != old_score and settings.SCORE_WRITE_BEHIND:
+        ScoreDelta.objects.bulk_create([
+            ScoreDelta(title_id=review.title_id, score=old_score, delta=-1),
+            ScoreDelta(title_id=review.title_id, score=review.score, delta=1),
+        ])
+    elif review.score != old_score:
+        apply_score_delta(review.title_id, review.score - old_score, 0)
+        apply_stats_delta(
+            review.title_id,
+            **shift(old_score, -1), **shift(review.score, 1)
+        )
+
+
+def review_deleted(review):
+    if settings.SCORE_WRITE_BEHIND:
+        ScoreDelta.objects.create(
+            title_id=review.title_id, score=review.score, delta=-1
+        )
+        return
+    apply_score_delta(review.title_id, -review.score, -1)
+    latest = (Review.objects.filter(title=OuterRef('pk'))
+              .order_by('-pub_date').values('pub_date')[:1])
+    apply_stats_delta(
+        review.title_id,
+        count=F('count') - 1,
+        latest_pub_date=Subquery(latest),
+        **shift(review.score, -1)
+    )
+
+
+def rebuild_ratings(title_ids=None):
+    """Пересчитывает рейтинги произведений по таблице отзывов.
+
+    Без title_ids пересчитываются все произведения.
+    """
+    if settings.SCORE_WRITE_BEHIND:
+        fold_score_deltas(title_ids)
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    reviews = (Review.objects.filter(title=OuterRef('pk'))
+               .order_by().values('title'))
+    titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0
+        ),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0
+        ),
+    )
+    titles.filter(rating_count=0).update(rating=None)
+    return titles.filter(rating_count__gt=0).update(
+        rating=F('rating_sum') / F('rating_count')
+    )
+
+
+def rebuild_title_stats(title_ids=None):
+    """Строит статистику произведений одним GROUP BY по отзывам.
+
+    Без title_ids пересчитываются все произведения.
+    """
+    if settings.SCORE_WRITE_BEHIND:
+        fold_score_deltas(title_ids)
+    titles = Title.objects.all()
+    reviews = Review.objects.order_by()
+    stats = TitleStats.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+        reviews = reviews.filter(title__in=title_ids)
+        stats = stats.filter(pk__in=title_ids)
+    histograms = {
+        score_field(score): Count('id', filter=Q(score=score))
+        for score in SCORES
+    }
+    rows = {
+        row.pop('title'): row
+        for row in reviews.values('title').annotate(
+            count=Count('id'), latest_pub_date=Max('pub_date'), **histograms
+        )
+    }
+    stats.delete()
+    created = TitleStats.objects.bulk_create(
+        TitleStats(title_id=pk, **rows.get(pk, {}))
+        for pk in titles.values_list('pk', flat=True)
+    )
+    return len(created)
+
+
+def histograms(deltas):
+    """Сумма изменений по оценкам: title_id → {оценка: изменение}."""
+    result = {}
+    rows = (deltas.order_by().values('title', 'score')
+            .annotate(total=Sum('delta')))
+    for row in rows:
+        histogram = result.setdefault(row['title'], dict.fromkeys(SCORES, 0))
+        histogram[row['score']] += row['total']
+    return result
+
+
+def lock_score_deltas():
+    """Берёт блокировку записи в начале транзакции, до первого чтения.
+
+    В SQLite транзакция, начатая чтением, при первой записи получает
+    SQLITE_BUSY без ожидания busy_timeout, если другой писатель успел
+    закоммитить после её чтения (WAL). Пустой UPDATE сразу забирает
+    блокировку записи; в других базах он ничего не делает.
+    """
+    ScoreDelta.objects.filter(pk__lt=0).update(delta=0)
+
+
+def fold_score_deltas(title_ids=None, batch_size=None):
+    """Сворачивает накопленные ScoreDelta в рейтинги и статистику.
+
+    Записи обрабатываются по порядку, по batch_size (по умолчанию
+    SCORE_FOLD_BATCH_SIZE) в транзакции, пока не кончатся; на
+    произведение в пачке приходится по одному UPDATE рейтинга
+    и статистики, сколько бы отзывов к нему ни пришло. Возвращает
+    число свёрнутых записей.
+    """
+    batch_size = batch_size or settings.SCORE_FOLD_BATCH_SIZE
+    deltas = ScoreDelta.objects.order_by('pk')
+    if title_ids is not None:
+        deltas = deltas.filter(title__in=title_ids)
+    folded = 0
+    while True:
+        with transaction.atomic():
+            lock_score_deltas()
+            pks = list(deltas.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return folded
+            # Ровно прочитанные записи: запись с меньшим pk, закоммиченная
+            # позже, достанется следующей пачке.
+            batch = ScoreDelta.objects.filter(pk__in=pks)
+            changes = histograms(batch)
+            # Сначала удаляем: при отсутствии строки статистики
+            # apply_stats_delta строит её по отзывам и снова сворачивает
+            # изменения этого произведения.
+            batch.delete()
+            latest = (Review.objects.filter(title=OuterRef('pk'))
+                      .order_by('-pub_date').values('pub_date')[:1])
+            for title_id, histogram in changes.items():
+                count = sum(histogram.values())
+                apply_score_delta(
+                    title_id,
+                    sum(score * delta for score, delta in histogram.items()),
+                    count,
+                )
+                updates = {}
+                for score, delta in histogram.items():
+                    if delta:
+                        updates.update(shift(score, delta))
+                apply_stats_delta(
+                    title_id,
+                    count=F('count') + count,
+                    latest_pub_date=Subquery(latest),
+                    **updates
+                )
+        folded += len(pks)
+
+
+class PendingScores:
+    """Ещё не свёрнутые изменения оценок одного произведения."""
+
+    def __init__(self, histogram, latest_pub_date):
+        self.histogram = histogram
+        self.latest_pub_date = latest_pub_date
+
+    @property
+    def count(self):
+        return sum(self.histogram.values())
+
+    @property
+    def total(self):
+        return sum(score * delta for score, delta in self.histogram.items())
+
+    def rating(self, rating_sum, rating_count):
+        count = rating_count + self.count
+        return (rating_sum + self.total) // count if count else None
+
+    def add_to_title(self, title):
+        title.rating = self.rating(title.rating_sum, title.rating_count)
+        title.rating_sum += self.total
+        title.rating_count += self.count
+        stats = getattr(title, 'stats', None)
+        if stats is not None:
+            self.add_to_stats(stats)
+
+    def add_to_stats(self, stats):
+        stats.count += self.count
+        for score, delta in self.histogram.items():
+            field = score_field(score)
+            setattr(stats, field, getattr(stats, field) + delta)
+        stats.latest_pub_date = self.latest_pub_date
+
+    def add_to_row(self, row):
+        """То же для строки TitleValuesSerializer."""
+        row['rating'] = self.rating(row['rating_sum'], row['rating_count'])
+        if row['stats__count'] is None:
+            return
+        row['stats__count'] += self.count
+        for score, delta in self.histogram.items():
+            row[f'stats__{score_field(score)}'] += delta
+        row['stats__latest_pub_date'] = self.latest_pub_date
+
+
+def pending_scores(title_ids):
+    """Несвёрнутые изменения оценок: title_id → PendingScores.
+
+    Пусто, если отложенный пересчёт выключен. Дата последнего отзыва
+    для произведений с изменениями берётся из отзывов: удаление
+    не выражается через изменения.
+    """
+    if not settings.SCORE_WRITE_BEHIND:
+        return {}
+    changes = histograms(ScoreDelta.objects.filter(title__in=title_ids))
+    if not changes:
+        return {}
+    latest = dict(
+        Review.objects.filter(title__in=changes).order_by()
+        .values('title').annotate(latest=Max('pub_date'))
+        .values_list('title', 'latest')
+    )
+    return {
+        title_id: PendingScores(histogram, latest.get(title_id))
+        for title_id, histogram in changes.items()
+    }
+
+
+def scores_snapshot():
+    """Транзакция, в которой рейтинги и ScoreDelta читаются согласованно.
+
+    Без неё изменения, свёрнутые между чтением произведения и чтением
+    ScoreDelta, выпали бы из ответа.
+    """
+    if not settings.SCORE_WRITE_BEHIND:
+        return nullcontext()
+    return transaction.atomic(using=router.db_for_read(Title))
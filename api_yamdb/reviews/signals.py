@@ -0,0 +1,92 @@
+import threading
+
+from django.db import connections, transaction
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from .models import Review, Title, TitleStats
+from .search import get_title_search
+from .services import review_created, review_deleted, review_updated
+
+_deleting = threading.local()
+
+
+def deleting_titles():
+    """Произведения, которые удаляются в этом потоке прямо сейчас.
+
+    Ключ — id произведения, значение — функция, снимающая отметку после
+    фиксации транзакции удаления.
+    """
+    if not hasattr(_deleting, 'ids'):
+        _deleting.ids = {}
+    return _deleting.ids
+
+
+def title_deleting(title_id, using):
+    done = deleting_titles().get(title_id)
+    if done is None:
+        return False
+    # Откат транзакции убирает её функции on_commit: удаление не
+    # состоялось, и отметка больше не действует.
+    if any(func is done for _, func in connections[using].run_on_commit):
+        return True
+    deleting_titles().pop(title_id, None)
+    return False
+
+
+@receiver(post_save, sender=Title)
+def index_title(sender, instance, **kwargs):
+    get_title_search().index(instance)
+
+
+@receiver(post_save, sender=Title)
+def create_title_stats(sender, instance, created, **kwargs):
+    if created:
+        TitleStats.objects.get_or_create(title=instance)
+
+
+@receiver(pre_delete, sender=Title)
+def mark_title_deleting(sender, instance, using, **kwargs):
+    # pre_delete всех собранных объектов приходит раньше post_delete
+    # каскадно удаляемых отзывов; удаление всегда идёт в транзакции.
+    titles = deleting_titles()
+    title_id = instance.pk
+
+    def done():
+        if titles.get(title_id) is done:
+            del titles[title_id]
+
+    titles[title_id] = done
+    transaction.on_commit(done, using=using)
+
+
+@receiver(post_delete, sender=Title)
+def remove_title(sender, instance, **kwargs):
+    deleting_titles().pop(instance.pk, None)
+    get_title_search().remove(instance.pk)
+
+
+@receiver(post_init, sender=Review)
+def remember_score(sender, instance, **kwargs):
+    # Через __dict__: отложенное поле не должно вызывать запрос.
+    instance._stored_score = instance.__dict__.get('score')
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """Рейтинг и статистика произведения при любом сохранении отзыва."""
+    if raw:
+        return
+    if created:
+        review_created(instance)
+    elif instance._stored_score is not None:
+        review_updated(instance, instance._stored_score)
+    instance._stored_score = instance.score
+
+
+@receiver(post_delete, sender=Review)
+def review_removed(sender, instance, using, **kwargs):
+    """То же при удалении, в том числе каскадном вместе с автором."""
+    if not title_deleting(instance.title_id, using):
+        review_deleted(instance)
@@ -0,0 +1,212 @@
+"""Нагрузочный тест: WSGI против ASGI при медленных клиентах.
+
+Запуск: ``pytest -s tests/benchmarks/bench_asgi.py``. Оба сервера
+поднимаются в процессе теста с пулом из BENCH_THREADS потоков:
+WSGI — wsgiref, каждый поток которого читает запрос и выполняет view;
+ASGI — простой HTTP-сервер на asyncio с ASGIHandler. BENCH_SLOW_CLIENTS
+клиентов присылают каждый запрос по частям в течение BENCH_SLOW_SECONDS
+секунд, BENCH_FAST_CLIENTS клиентов шлют запросы без пауз; замер длится
+BENCH_DURATION секунд. Печатается пропускная способность и задержки
+быстрых клиентов.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+import pytest
+
+THREADS = int(os.environ.get('BENCH_THREADS', 4))
+SLOW_CLIENTS = int(os.environ.get('BENCH_SLOW_CLIENTS', 16))
+FAST_CLIENTS = int(os.environ.get('BENCH_FAST_CLIENTS', 4))
+SLOW_SECONDS = float(os.environ.get('BENCH_SLOW_SECONDS', 2))
+DURATION = float(os.environ.get('BENCH_DURATION', 5))
+
+URLS = ('/api/v1/titles/', '/api/v1/titles/1/', '/api/v1/titles/1/reviews/')
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """wsgiref с пулом потоков, как синхронный воркер с THREADS потоками."""
+
+    request_queue_size = 1024
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = ThreadPoolExecutor(max_workers=THREADS)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.handle, request, client_address)
+
+    def handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+
+def start_wsgi():
+    from django.core.wsgi import get_wsgi_application
+
+    server = PooledWSGIServer(('127.0.0.1', 0), QuietHandler)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+    return server.server_address[1], stop
+
+
+async def serve_asgi(app, reader, writer):
+    """Одно соединение HTTP/1.1 без keep-alive."""
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except (asyncio.IncompleteReadError, ConnectionError):
+        writer.close()
+        return
+    lines = head.decode('latin1').split('\r\n')
+    method, target, _ = lines[0].split(' ')
+    headers = [
+        (name.strip().lower().encode('latin1'), value.strip().encode('latin1'))
+        for name, value in (line.split(':', 1) for line in lines[1:] if line)
+    ]
+    length = int(dict(headers).get(b'content-length', 0))
+    body = await reader.readexactly(length) if length else b''
+    path, _, query = target.partition('?')
+
+    async def receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            writer.write(
+                f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n'
+                .encode('latin1')
+            )
+            for name, value in message['headers']:
+                writer.write(name + b': ' + value + b'\r\n')
+            writer.write(b'Connection: close\r\n\r\n')
+        else:
+            writer.write(message.get('body', b''))
+    await app({
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'path': path,
+        'query_string': query.encode('latin1'),
+        'headers': headers,
+        'client': writer.get_extra_info('peername'),
+        'server': writer.get_extra_info('sockname'),
+    }, receive, send)
+    await writer.drain()
+    writer.close()
+
+
+def start_asgi():
+    from api_yamdb.asgi_handler import ASGIHandler
+
+    app = ASGIHandler(threads=THREADS)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    state = {}
+
+    async def main():
+        state['server'] = await asyncio.start_server(
+            lambda reader, writer: serve_asgi(app, reader, writer),
+            '127.0.0.1', 0, backlog=1024,
+        )
+        state['port'] = state['server'].sockets[0].getsockname()[1]
+        started.set()
+        await state['server'].serve_forever()
+
+    loop.create_task(main())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        app.executor.shutdown(wait=False)
+    return state['port'], stop
+
+
+def request(url):
+    return (f'GET {url} HTTP/1.1\r\nHost: testserver\r\n'
+            'Connection: close\r\n\r\n').encode()
+
+
+async def fetch(port, url, slow):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    data = request(url)
+    if slow:
+        step = SLOW_SECONDS / len(data)
+        for byte in range(len(data)):
+            writer.write(data[byte:byte + 1])
+            await asyncio.sleep(step)
+    else:
+        writer.write(data)
+    response = await reader.read()
+    writer.close()
+    assert response.split(b' ', 2)[1] == b'200', response[:200]
+
+
+async def client(port, slow, deadline, latencies):
+    number = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await fetch(port, URLS[number % len(URLS)], slow)
+        if not slow:
+            latencies.append((time.perf_counter() - started) * 1000)
+        number += 1
+
+
+async def load(port):
+    latencies = []
+    deadline = time.perf_counter() + DURATION
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, number < SLOW_CLIENTS, deadline, latencies)
+        for number in range(SLOW_CLIENTS + FAST_CLIENTS)
+    ))
+    return latencies, time.perf_counter() - started
+
+
+def report(name, latencies, elapsed):
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] if latencies else float('nan')
+    p99 = (latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+           if latencies else float('nan'))
+    print(f'{name}: {len(latencies) / elapsed:.1f} запросов/с у быстрых '
+          f'клиентов, p50 {p50:.1f} мс, p99 {p99:.1f} мс')
+    return len(latencies) / elapsed
+
+
+@pytest.mark.django_db
+def test_slow_clients(dataset, django_db_blocker):
+    print(f'\n{THREADS} потоков, {SLOW_CLIENTS} медленных и {FAST_CLIENTS} '
+          f'быстрых клиентов, {DURATION:.0f} с')
+    results = {}
+    with django_db_blocker.unblock():
+        for name, start in (('WSGI', start_wsgi), ('ASGI', start_asgi)):
+            port, stop = start()
+            try:
+                results[name] = report(name, *asyncio.run(load(port)))
+            finally:
+                stop()
+    if SLOW_CLIENTS >= THREADS:
+        assert results['ASGI'] > results['WSGI']
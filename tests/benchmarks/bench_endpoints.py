@@ -0,0 +1,250 @@
+"""Бенчмарк эндпоинтов /api/v1.
+
+Запуск: ``pytest tests/benchmarks/bench_endpoints.py``. Объём данных
+задаётся переменными BENCH_TITLES, BENCH_REVIEWS, BENCH_COMMENTS, число
+замеров — BENCH_ITERATIONS. Результаты пишутся в BENCH_OUTPUT
+(по умолчанию bench_baseline.json); если указан BENCH_BASELINE, число
+запросов к базе сравнивается с сохранённым базовым значением.
+"""
+import json
+import os
+import time
+import tracemalloc
+
+import django
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from rest_framework.test import APIClient
+
+from .seed import SCALE
+
+ITERATIONS = int(os.environ.get('BENCH_ITERATIONS', 30))
+OUTPUT = os.environ.get('BENCH_OUTPUT', 'bench_baseline.json')
+BASELINE = os.environ.get('BENCH_BASELINE')
+
+RESULTS = {}
+
+
+def new_category(i):
+    from reviews.models import Category
+    Category.objects.create(name='Удаляемая', slug=f'delcategory{i}')
+    return f'/api/v1/categories/delcategory{i}/'
+
+
+def new_genre(i):
+    from reviews.models import Genre
+    Genre.objects.create(name='Удаляемый', slug=f'delgenre{i}')
+    return f'/api/v1/genres/delgenre{i}/'
+
+
+def new_title(i):
+    from reviews.models import Title
+    title = Title.objects.create(
+        name='Удаляемое', year=2000, description='Описание', category_id=1
+    )
+    return f'/api/v1/titles/{title.pk}/'
+
+
+def new_user(i):
+    from reviews.models import User
+    User.objects.create(username=f'deluser{i}', email=f'deluser{i}@yamdb.fake')
+    return f'/api/v1/users/deluser{i}/'
+
+
+def new_review(i):
+    from reviews.models import Review, User
+    author = User.objects.create(
+        username=f'delreviewer{i}', email=f'delreviewer{i}@yamdb.fake'
+    )
+    review = Review.objects.create(
+        title_id=1, author=author, text='Удаляемый', score=5
+    )
+    return f'/api/v1/titles/1/reviews/{review.pk}/'
+
+
+def new_comment(i):
+    from reviews.models import Comment
+    comment = Comment.objects.create(
+        review_id=1, author_id=1, text='Удаляемый'
+    )
+    return f'/api/v1/titles/1/reviews/1/comments/{comment.pk}/'
+
+
+def batch(i, size=10):
+    # Каждый замер — новые произведения: повторный отзыв был бы ошибкой.
+    return [{'title': i * size + n, 'text': 'Отзыв', 'score': 7}
+            for n in range(1, size + 1)]
+
+
+CASES = [
+    ('users.list', 'get', '/api/v1/users/', 'admin_client', None),
+    ('users.retrieve', 'get', '/api/v1/users/bench1/', 'admin_client', None),
+    ('users.update', 'patch', '/api/v1/users/bench1/', 'admin_client',
+     lambda i: {'bio': f'Био {i}'}),
+    ('users.destroy', 'delete', new_user, 'admin_client', None),
+    ('users.me', 'get', '/api/v1/users/me/', 'user_client', None),
+    ('users.me.update', 'patch', '/api/v1/users/me/', 'user_client',
+     lambda i: {'bio': f'Био {i}'}),
+    ('users.create', 'post', '/api/v1/users/', 'admin_client',
+     lambda i: {'username': f'created{i}', 'email': f'created{i}@yamdb.fake'}),
+    ('titles.list', 'get', '/api/v1/titles/', 'anon', None),
+    ('titles.list.filtered', 'get',
+     '/api/v1/titles/?genre=genre1&category=category1&year=1901',
+     'anon', None),
+    ('titles.list.name', 'get', '/api/v1/titles/?name=Произведение 1',
+     'anon', None),
+    ('titles.search', 'get', '/api/v1/titles/?q=Произведение 1',
+     'anon', None),
+    ('titles.retrieve', 'get', '/api/v1/titles/1/', 'anon', None),
+    ('titles.stats', 'get', '/api/v1/titles/1/stats/', 'anon', None),
+    ('titles.create', 'post', '/api/v1/titles/', 'admin_client',
+     lambda i: {'name': f'Новое {i}', 'year': 2000, 'genre': ['genre1'],
+                'category': 'category1', 'description': 'Описание'}),
+    ('titles.update', 'patch', '/api/v1/titles/1/', 'admin_client',
+     lambda i: {'description': f'Описание {i}'}),
+    ('titles.destroy', 'delete', new_title, 'admin_client', None),
+    ('categories.list', 'get', '/api/v1/categories/', 'anon', None),
+    ('categories.create', 'post', '/api/v1/categories/', 'admin_client',
+     lambda i: {'name': 'Новая', 'slug': f'newcategory{i}'}),
+    ('categories.destroy', 'delete', new_category, 'admin_client', None),
+    ('genres.list', 'get', '/api/v1/genres/', 'anon', None),
+    ('genres.create', 'post', '/api/v1/genres/', 'admin_client',
+     lambda i: {'name': 'Новый', 'slug': f'newgenre{i}'}),
+    ('genres.destroy', 'delete', new_genre, 'admin_client', None),
+    ('reviews.list', 'get', '/api/v1/titles/1/reviews/', 'anon', None),
+    ('reviews.list.cached', 'get', '/api/v1/titles/1/reviews/', 'anon',
+     None),
+    ('reviews.list.deep', 'get',
+     '/api/v1/titles/1/reviews/?limit=5&offset=1000', 'anon', None),
+    ('reviews.list.cursor', 'get',
+     '/api/v1/titles/1/reviews/?cursor=&limit=5', 'anon', None),
+    ('reviews.retrieve', 'get', '/api/v1/titles/1/reviews/1/', 'anon', None),
+    ('reviews.create', 'post', lambda i: f'/api/v1/titles/{i + 1}/reviews/',
+     'admin_client', lambda i: {'text': 'Отзыв', 'score': 7}),
+    ('reviews.update', 'patch', '/api/v1/titles/1/reviews/1/',
+     'admin_client', lambda i: {'score': i % 10 + 1}),
+    ('reviews.destroy', 'delete', new_review, 'admin_client', None),
+    ('reviews.batch', 'post', '/api/v1/reviews/batch/', 'user_client',
+     batch),
+    ('comments.list', 'get', '/api/v1/titles/1/reviews/1/comments/',
+     'anon', None),
+    ('comments.retrieve', 'get', '/api/v1/titles/1/reviews/1/comments/1/',
+     'anon', None),
+    ('comments.create', 'post', '/api/v1/titles/1/reviews/1/comments/',
+     'user_client', lambda i: {'text': 'Комментарий'}),
+    ('comments.update', 'patch', '/api/v1/titles/1/reviews/1/comments/1/',
+     'admin_client', lambda i: {'text': f'Комментарий {i}'}),
+    ('comments.destroy', 'delete', new_comment, 'admin_client', None),
+    ('auth.signup', 'post', '/api/v1/auth/signup/', 'anon',
+     lambda i: {'username': f'signup{i}', 'email': f'signup{i}@yamdb.fake'}),
+    ('auth.token', 'post', '/api/v1/auth/token/', 'anon',
+     lambda i: {'username': 'bench1', 'confirmation_code': 'invalid'}),
+    ('export.reviews', 'get', '/api/v1/export/reviews/', 'admin_client',
+     None),
+    ('metrics', 'get', '/api/v1/_metrics/', 'admin_client', None),
+]
+
+# Иначе после первого запроса эти случаи замеряют попадание в кеш
+# страниц отзывов, а не запросы к базе.
+UNCACHED = {'reviews.list', 'reviews.list.deep', 'reviews.list.cursor'}
+
+
+@pytest.fixture(scope='module')
+def baseline(dataset):
+    yield
+    baseline = {
+        'meta': {
+            'scale': SCALE,
+            'iterations': ITERATIONS,
+            'django': django.get_version(),
+            'vendor': connection.vendor,
+        },
+        'endpoints': RESULTS,
+    }
+    with open(OUTPUT, 'w', encoding='utf-8') as file:
+        json.dump(baseline, file, ensure_ascii=False, indent=2,
+                  sort_keys=True)
+
+
+@pytest.fixture(autouse=True)
+def no_throttling(settings):
+    # Иначе auth.signup и auth.token после первых запросов замеряют 429.
+    settings.REST_FRAMEWORK = {
+        **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}
+    }
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def perform(client, method, url, payload, i):
+    if callable(url):
+        url = url(i)
+    data = payload(i) if payload else None
+    response = getattr(client, method)(url, data=data, format='json')
+    if response.streaming:
+        # Потоковый ответ строится только при чтении.
+        b''.join(response.streaming_content)
+    return response
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'name,method,url,client_name,payload', CASES,
+    ids=[case[0] for case in CASES]
+)
+def test_endpoint(baseline, request, name, method, url, client_name, payload):
+    client = (APIClient() if client_name == 'anon'
+              else request.getfixturevalue(client_name))
+    pages = caches['default']
+
+    perform(client, method, url, payload, 0)
+    if name in UNCACHED:
+        pages.clear()
+    tracemalloc.start()
+    try:
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            response = perform(client, method, url, payload, 1)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert response.status_code < 500, response.content
+
+    samples = []
+    for i in range(2, ITERATIONS + 2):
+        if name in UNCACHED:
+            pages.clear()
+        started = time.perf_counter()
+        perform(client, method, url, payload, i)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    RESULTS[name] = {
+        'method': method.upper(),
+        'status': response.status_code,
+        'queries': queries.count,
+        'p50_ms': round(percentile(samples, 0.5), 3),
+        'p99_ms': round(percentile(samples, 0.99), 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+    if BASELINE:
+        with open(BASELINE, encoding='utf-8') as file:
+            expected = json.load(file)['endpoints'].get(name)
+        if expected is not None:
+            assert queries.count <= expected['queries'], (
+                f'{name}: запросов к базе {queries.count}, '
+                f'в базовой линии {expected["queries"]}'
+            )
@@ -0,0 +1,64 @@
+"""Бенчмарк JSON-рендереров: JSONRenderer против FastJSONRenderer.
+
+Запуск: ``pytest -s tests/benchmarks/bench_renderers.py``. Полезная
+нагрузка — страницы произведений и отзывов из BENCH_PAGE строк в том
+виде, в каком их отдают списки API; число замеров — BENCH_ITERATIONS.
+"""
+import os
+import time
+from collections import OrderedDict
+
+import pytest
+
+PAGE = int(os.environ.get('BENCH_PAGE', 500))
+ITERATIONS = int(os.environ.get('BENCH_ITERATIONS', 30))
+
+
+def page(results):
+    return OrderedDict([
+        ('count', len(results)),
+        ('next', f'http://testserver/api/v1/?limit={PAGE}&offset={PAGE}'),
+        ('previous', None),
+        ('results', results),
+    ])
+
+
+def payloads():
+    from api.fast_serializers import (ReviewValuesSerializer,
+                                      TitleValuesSerializer)
+    from reviews.models import Review, Title
+
+    titles = TitleValuesSerializer()
+    reviews = ReviewValuesSerializer()
+    return [
+        ('titles', page(titles.serialize(list(titles.values(
+            Title.objects.order_by('id')[:PAGE]
+        ))))),
+        ('reviews', page(reviews.serialize(list(reviews.values(
+            Review.objects.order_by('-pub_date', '-id')[:PAGE]
+        ))))),
+    ]
+
+
+def best_of(render, data):
+    samples = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        body = render(data)
+        samples.append((time.perf_counter() - started) * 1000)
+    return min(samples), body
+
+
+@pytest.mark.django_db
+def test_renderers(dataset):
+    from api import renderers
+    from rest_framework.renderers import JSONRenderer
+
+    backend = 'orjson' if renderers.orjson else 'json (orjson не установлен)'
+    for name, data in payloads():
+        json_ms, expected = best_of(JSONRenderer().render, data)
+        fast_ms, body = best_of(renderers.FastJSONRenderer().render, data)
+        assert body == expected, f'{name}: ответы не совпадают'
+        print(f'{name}: {len(body) / 1024:.0f} КиБ, JSONRenderer '
+              f'{json_ms:.2f} мс, FastJSONRenderer на {backend} '
+              f'{fast_ms:.2f} мс, ускорение {json_ms / fast_ms:.1f}x')
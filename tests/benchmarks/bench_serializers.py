@@ -0,0 +1,61 @@
+"""Микробенчмарк сериализаторов списков: ModelSerializer против .values().
+
+Запуск: ``pytest -s tests/benchmarks/bench_serializers.py``. Размер
+страницы задаётся BENCH_PAGE, число замеров — BENCH_ITERATIONS; объём
+данных — как в bench_endpoints.
+"""
+import os
+import time
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+PAGE = int(os.environ.get('BENCH_PAGE', 500))
+ITERATIONS = int(os.environ.get('BENCH_ITERATIONS', 30))
+
+
+def cases():
+    from api.fast_serializers import (CommentValuesSerializer,
+                                      ReviewValuesSerializer,
+                                      TitleValuesSerializer)
+    from api.serializers import (CommentSerializer, ReviewSerializer,
+                                 TitleSerializer)
+    from reviews.models import Comment, Review, Title
+
+    return [
+        ('titles', TitleSerializer, TitleValuesSerializer(),
+         Title.objects.select_related('category', 'stats')
+         .prefetch_related('genre').order_by('id')),
+        ('reviews', ReviewSerializer, ReviewValuesSerializer(),
+         Review.objects.order_by('-pub_date', '-id')),
+        ('comments', CommentSerializer, CommentValuesSerializer(),
+         Comment.objects.order_by('-pub_date', '-id')),
+    ]
+
+
+def best_of(render):
+    samples = []
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        body = render()
+        samples.append((time.perf_counter() - started) * 1000)
+    return min(samples), body
+
+
+@pytest.mark.django_db
+def test_fast_serializers(dataset):
+    renderer = JSONRenderer()
+    for name, serializer_class, fast, queryset in cases():
+        # Срез каждый раз новый: иначе QuerySet и связанные объекты
+        # останутся в кеше после первого замера.
+        model_ms, expected = best_of(lambda: renderer.render(
+            serializer_class(queryset[:PAGE], many=True).data
+        ))
+        fast_ms, body = best_of(lambda: renderer.render(
+            fast.serialize(list(fast.values(queryset[:PAGE])))
+        ))
+        assert body == expected, f'{name}: ответы не совпадают'
+        print(f'{name}: {PAGE} строк, ModelSerializer {model_ms:.2f} мс, '
+              f'values() {fast_ms:.2f} мс, ускорение '
+              f'{model_ms / fast_ms:.1f}x')
+        assert fast_ms < model_ms
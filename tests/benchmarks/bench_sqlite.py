@@ -0,0 +1,127 @@
+"""Бенчмарк одновременной записи отзывов по профилям базы DB_PROFILES.
+
+Запуск: ``pytest -s tests/benchmarks/bench_sqlite.py``. База — свой файл
+SQLite во временном каталоге, а не тестовая база сессии: та может быть
+в памяти, где WAL не работает.
+BENCH_WRITERS потоков одновременно отправляют POST
+/api/v1/titles/{id}/reviews/, каждый — BENCH_WRITES отзывов от своего
+пользователя. Для каждого профиля печатается число записей в секунду и
+число неудачных запросов (``database is locked``). Профили идут
+в порядке DB_PROFILES: режим WAL сохраняется в файле базы.
+"""
+import json
+import os
+import threading
+import time
+
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.db import connections
+from rest_framework.test import APIRequestFactory
+
+WRITERS = int(os.environ.get('BENCH_WRITERS', 32))
+WRITES = int(os.environ.get('BENCH_WRITES', 30))
+
+
+@pytest.fixture(scope='module')
+def database(django_db_blocker, tmp_path_factory):
+    """Подменяет default на файл с миграциями на время модуля.
+
+    Потоки открывают соединения по connections.databases, текущий
+    поток — через новый объект соединения; прежние возвращаются после.
+    """
+    original = connections['default']
+    settings_dict = {
+        **original.settings_dict,
+        'NAME': str(tmp_path_factory.mktemp('bench') / 'db.sqlite3'),
+    }
+    connections.databases['default'] = settings_dict
+    connections['default'] = original.__class__(settings_dict, 'default')
+    try:
+        with django_db_blocker.unblock():
+            call_command('migrate', verbosity=0, interactive=False)
+        yield
+    finally:
+        connections['default'].close()
+        connections['default'] = original
+        connections.databases['default'] = original.settings_dict
+
+
+@pytest.fixture(scope='module')
+def dataset(database, django_db_blocker):
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from reviews.models import Category, Title, User
+
+    with django_db_blocker.unblock():
+        category = Category.objects.create(name='Категория', slug='bench')
+        titles = [
+            Title.objects.create(name=f'Произведение {number}', year=2000,
+                                 category=category).pk
+            for number in range(WRITES)
+        ]
+        tokens = [
+            str(AccessToken.for_user(User.objects.create_user(
+                username=f'writer{number}', email=f'writer{number}@yamdb.fake'
+            )))
+            for number in range(WRITERS)
+        ]
+    yield titles, tokens
+
+
+def writer(handler, token, titles, statuses):
+    factory = APIRequestFactory()
+    for number, title in enumerate(titles):
+        request = factory.post(
+            f'/api/v1/titles/{title}/reviews/',
+            json.dumps({'text': 'Отзыв', 'score': number % 10 + 1}),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+        result = handler(
+            request.environ, lambda status, headers, exc_info=None: None
+        )
+        statuses.append(result.status_code)
+        result.close()
+    connections.close_all()
+
+
+def run(profile, titles, tokens):
+    from django.conf import settings
+
+    from reviews.models import Review
+
+    Review.objects.all().delete()
+    connections.close_all()
+    for database in connections.databases.values():
+        database['CONN_MAX_AGE'] = profile['CONN_MAX_AGE']
+    settings.SQLITE_PRAGMAS = profile['PRAGMAS']
+    handler = WSGIHandler()
+    statuses = []
+    threads = [
+        threading.Thread(target=writer,
+                         args=(handler, token, titles, statuses))
+        for token in tokens
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    created = statuses.count(201)
+    return created / elapsed, len(statuses) - created
+
+
+def test_concurrent_reviews(dataset, settings, django_db_blocker):
+    titles, tokens = dataset
+    print(f'\n{WRITERS} потоков по {WRITES} отзывов')
+    results = {}
+    with django_db_blocker.unblock():
+        for name, profile in settings.DB_PROFILES.items():
+            rate, failed = run(profile, titles, tokens)
+            results[name] = rate, failed
+            print(f'{name}: {rate:.1f} записей/с, неудачных запросов '
+                  f'{failed}')
+    assert results['production'][1] == 0
@@ -0,0 +1,17 @@
+import pytest
+
+from .seed import SCALE, seed
+
+
+@pytest.fixture(scope='session')
+def dataset(django_db_setup, django_db_blocker):
+    """Набор данных SCALE, один на все бенчмарки сессии.
+
+    Данные пишутся вне транзакций тестов и остаются в базе до конца
+    сессии, поэтому заполнять её повторно с теми же pk нельзя. Бенчмарки
+    с этим набором не должны быть транзакционными: после такого теста
+    база очищается.
+    """
+    with django_db_blocker.unblock():
+        seed(**SCALE)
+    yield SCALE
@@ -0,0 +1,68 @@
+import os
+from itertools import islice
+
+BATCH_SIZE = 5000
+
+SCALE = {
+    'titles': int(os.environ.get('BENCH_TITLES', 1000)),
+    'reviews': int(os.environ.get('BENCH_REVIEWS', 20000)),
+    'comments': int(os.environ.get('BENCH_COMMENTS', 40000)),
+}
+
+
+def bulk(model, objs):
+    objs = iter(objs)
+    batch = list(islice(objs, BATCH_SIZE))
+    while batch:
+        model.objects.bulk_create(batch)
+        batch = list(islice(objs, BATCH_SIZE))
+
+
+def seed(titles, reviews, comments):
+    """Синтетический набор данных: reviews по кругу раскладываются по titles.
+
+    На одно произведение один автор пишет один отзыв, поэтому число
+    авторов равно ceil(reviews / titles).
+    """
+    from reviews.models import (Category, Comment, Genre, Review, Title,
+                                TitleGenre, User)
+    from reviews.search import get_title_search
+    from reviews.services import rebuild_ratings, rebuild_title_stats
+
+    authors = max(1, -(-reviews // titles))
+    bulk(User, (
+        User(pk=i, username=f'bench{i}', email=f'bench{i}@yamdb.fake',
+             password='!')
+        for i in range(1, authors + 1)
+    ))
+    bulk(Category, (
+        Category(pk=i, name=f'Категория {i}', slug=f'category{i}')
+        for i in range(1, 4)
+    ))
+    bulk(Genre, (
+        Genre(pk=i, name=f'Жанр {i}', slug=f'genre{i}')
+        for i in range(1, 16)
+    ))
+    bulk(Title, (
+        Title(pk=i, name=f'Произведение {i}', year=1900 + i % 120,
+              description=f'Описание {i}', category_id=i % 3 + 1)
+        for i in range(1, titles + 1)
+    ))
+    bulk(TitleGenre, (
+        TitleGenre(title_id=i // 2 + 1, genre_id=(i + i // 2) % 15 + 1)
+        for i in range(titles * 2)
+    ))
+    bulk(Review, (
+        Review(pk=i + 1, title_id=i % titles + 1,
+               author_id=i // titles + 1, text=f'Отзыв {i}',
+               score=i % 10 + 1)
+        for i in range(reviews)
+    ))
+    bulk(Comment, (
+        Comment(review_id=i % reviews + 1, author_id=i % authors + 1,
+                text=f'Комментарий {i}')
+        for i in range(comments if reviews else 0)
+    ))
+    rebuild_ratings()
+    rebuild_title_stats()
+    get_title_search().rebuild()
@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+    yield
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_throttles():
+    from api.throttling import get_bucket_store
+
+    get_bucket_store().clear()
+    get_bucket_store.cache_clear()
+    yield
+    get_bucket_store().clear()
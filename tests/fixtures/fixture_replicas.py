@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+
+
+class SQLiteReplicas:
+    """Реплики как отдельные файлы sqlite; sync() копирует в них default."""
+
+    def __init__(self, path, amount):
+        self.aliases = [f'replica{number}' for number in range(1, amount + 1)]
+        self.paths = [str(path / f'{alias}.sqlite3') for alias in self.aliases]
+
+    def add(self):
+        from django.db import connections
+
+        for alias, path in zip(self.aliases, self.paths):
+            connections.databases[alias] = {
+                'ENGINE': 'django.db.backends.sqlite3', 'NAME': path,
+            }
+
+    def sync(self):
+        from django.db import connections
+
+        primary = connections['default']
+        primary.ensure_connection()
+        for path in self.paths:
+            target = sqlite3.connect(path)
+            primary.connection.backup(target)
+            target.close()
+
+    def remove(self):
+        from django.db import connections
+
+        for alias in self.aliases:
+            connections[alias].close()
+            del connections[alias]
+            del connections.databases[alias]
+
+
+@pytest.fixture
+def replicas(transactional_db, settings, tmp_path):
+    harness = SQLiteReplicas(tmp_path, 2)
+    harness.add()
+    harness.sync()
+    settings.DATABASE_REPLICAS = harness.aliases
+    yield harness
+    harness.remove()
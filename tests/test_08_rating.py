@@ -0,0 +1,137 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08RatingAPI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_reviews(self, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = admin_client.get(url)
+        assert response.json()['rating'] == 4, (
+            f'Проверьте, что при GET запросе `{url}` рейтинг произведения '
+            'равен среднему значению оценок его отзывов'
+        )
+        response = admin_client.get(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert response.json()['rating'] is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`'
+        )
+
+        client_user = auth_client(user)
+        client_user.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9}
+        )
+        assert admin_client.get(url).json()['rating'] == 6, (
+            'Проверьте, что при изменении оценки отзыва пересчитывается '
+            'рейтинг произведения'
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        assert admin_client.get(url).json()['rating'] == 6, (
+            'Проверьте, что при удалении отзыва пересчитывается '
+            'рейтинг произведения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_ratings(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('rebuild_ratings', stdout=StringIO())
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            12, 3, 4
+        ), (
+            'Проверьте, что команда `rebuild_ratings` восстанавливает '
+            'сумму, количество оценок и рейтинг произведения'
+        )
+        title = Title.objects.get(pk=titles[1]['id'])
+        assert title.rating is None and title.rating_count == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rating_after_cascade(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        for author in (user, moderator):
+            response = admin_client.delete(f'/api/v1/users/{author.username}/')
+            assert response.status_code == 204
+        assert admin_client.get(url).json()['rating'] == 5, (
+            'Проверьте, что рейтинг пересчитывается, когда отзывы удаляются '
+            'вместе с автором'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (5, 1)
+
+        response = admin_client.delete(url)
+        assert response.status_code == 204, (
+            'Проверьте, что произведение с отзывами удаляется'
+        )
+        assert not Title.objects.filter(pk=titles[0]['id']).exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_title_save_keeps_rating(self, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = admin_client.patch(url, data={'name': 'Новое название'})
+        assert response.status_code == 200
+        assert admin_client.get(url).json()['rating'] == 4, (
+            'Проверьте, что изменение произведения после отзыва не сбрасывает '
+            'его рейтинг'
+        )
+
+        stale = Title.objects.get(pk=titles[0]['id'])
+        Title.objects.filter(pk=stale.pk).update(
+            rating_sum=20, rating_count=4, rating=5
+        )
+        stale.description = 'Новое описание'
+        stale.save()
+        title = Title.objects.get(pk=stale.pk)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            20, 4, 5
+        ), (
+            'Проверьте, что сохранение загруженного раньше произведения '
+            'не затирает сумму, количество оценок и рейтинг'
+        )
+        assert title.description == 'Новое описание'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_rating_after_failed_title_delete(self, admin_client, admin):
+        from django.db.models.signals import post_delete
+        from reviews.models import Review, Title
+
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+
+        def fail(**kwargs):
+            raise RuntimeError('удаление прервано')
+
+        post_delete.connect(fail, sender=Review)
+        try:
+            with pytest.raises(RuntimeError):
+                Title.objects.get(pk=titles[0]['id']).delete()
+        finally:
+            post_delete.disconnect(fail, sender=Review)
+        assert Review.objects.filter(title_id=titles[0]['id']).count() == 3
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = admin_client.delete(
+            f'{url}reviews/{reviews[0]["id"]}/'
+        )
+        assert response.status_code == 204
+        assert admin_client.get(url).json()['rating'] == 3, (
+            'Проверьте, что после неудачного удаления произведения рейтинг '
+            'снова пересчитывается при удалении его отзывов'
+        )
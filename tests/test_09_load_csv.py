@@ -0,0 +1,35 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+class Test09LoadCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_load_csv(self):
+        from reviews.models import Comment, Review, Title, User
+
+        out = StringIO()
+        call_command('load_csv', stdout=out)
+        assert User.objects.count() == 5
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert 'строк/с' in out.getvalue(), (
+            'Проверьте, что команда `load_csv` выводит скорость загрузки '
+            'для каждой таблицы'
+        )
+
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `load_csv` сохраняет дату публикации '
+            'отзыва из файла'
+        )
+        title = Title.objects.get(pk=1)
+        assert (title.rating_count, title.rating) == (2, 10), (
+            'Проверьте, что после загрузки отзывов пересчитываются '
+            'рейтинги произведений'
+        )
+        user = User.objects.get(username='bingobongo')
+        assert not user.has_usable_password()
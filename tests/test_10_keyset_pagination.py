@@ -0,0 +1,48 @@
+import pytest
+
+from .common import create_comments, create_reviews
+
+
+class Test10KeysetPagination:
+
+    def collect(self, client, url):
+        ids = []
+        response = client.get(f'{url}?cursor=&limit=2')
+        while True:
+            assert response.status_code == 200
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсора не выполняется подсчёт '
+                'общего количества объектов'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            if data['next'] is None:
+                return ids
+            response = client.get(data['next'])
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_cursor(self, client, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        ids = self.collect(client, url)
+        assert ids == sorted((review['id'] for review in reviews),
+                             reverse=True), (
+            f'Проверьте, что при GET запросе `{url}?cursor=` отзывы '
+            'отдаются постранично от новых к старым без пропусков и повторов'
+        )
+        response = client.get(url)
+        assert 'count' in response.json(), (
+            f'Проверьте, что без параметра `cursor` запрос `{url}` '
+            'использует пагинацию limit/offset'
+        )
+        response = client.get(f'{url}?cursor=broken')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_cursor(self, client, admin_client, admin):
+        comments, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        ids = self.collect(client, url)
+        assert ids == sorted((comment['id'] for comment in comments),
+                             reverse=True)
@@ -0,0 +1,65 @@
+import pytest
+
+from .common import auth_client, create_reviews
+
+
+class Test11ReviewsCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_page_cached(
+            self, client, admin_client, admin, django_assert_num_queries):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        first = client.get(url).json()
+        with django_assert_num_queries(0):
+            second = client.get(url).json()
+        assert first == second, (
+            f'Проверьте, что повторный GET запрос `{url}` отдаёт страницу '
+            'из кеша без обращений к базе данных'
+        )
+
+        client_user = auth_client(user)
+        client_user.patch(f'{url}{reviews[1]["id"]}/', data={'text': 'new'})
+        texts = [review['text'] for review in client.get(url).json()['results']]
+        assert 'new' in texts, (
+            'Проверьте, что изменение отзыва сбрасывает кеш страниц отзывов'
+        )
+
+        client_user.delete(f'{url}{reviews[1]["id"]}/')
+        assert client.get(url).json()['count'] == len(reviews) - 1, (
+            'Проверьте, что удаление отзыва сбрасывает кеш страниц отзывов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_deleted_title_not_served(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        client.get(url)
+        admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert client.get(url).status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_author_changes_reset_cache(self, client, admin_client, admin):
+        _, titles, user, moderator = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        client.get(url)
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == 200
+        authors = [review['author']
+                   for review in client.get(url).json()['results']]
+        assert 'renamed' in authors and user.username not in authors, (
+            'Проверьте, что смена имени автора сбрасывает кеш страниц отзывов'
+        )
+
+        response = admin_client.delete(
+            f'/api/v1/users/{moderator.username}/'
+        )
+        assert response.status_code == 204
+        authors = [review['author']
+                   for review in client.get(url).json()['results']]
+        assert moderator.username not in authors, (
+            'Проверьте, что каскадное удаление отзывов вместе с автором '
+            'сбрасывает кеш страниц отзывов'
+        )
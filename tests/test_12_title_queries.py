@@ -0,0 +1,46 @@
+import pytest
+
+from .common import create_genre, create_categories
+
+
+class Test12TitleQueries:
+
+    def create_titles(self, admin_client, amount):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        for number in range(amount):
+            data = {
+                'name': f'Произведение {number}',
+                'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[0]['slug'],
+                'description': 'Описание',
+            }
+            admin_client.post('/api/v1/titles/', data=data)
+        return genres
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('limit', [1, 5, 10])
+    def test_01_title_list_queries(
+            self, client, admin_client, limit, django_assert_num_queries):
+        genres = self.create_titles(admin_client, 10)
+        url = '/api/v1/titles/'
+        for params in ({'limit': limit},
+                       {'limit': limit, 'genre': genres[0]['slug']}):
+            with django_assert_num_queries(3):
+                response = client.get(url, params)
+            results = response.json()['results']
+            assert len(results) == limit
+            assert all(len(title['genre']) == len(genres)
+                       for title in results), (
+                f'Проверьте, что GET запрос `{url}` возвращает все жанры '
+                'произведения за фиксированное число запросов к базе'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail_queries(
+            self, client, admin_client, django_assert_num_queries):
+        self.create_titles(admin_client, 1)
+        title_id = client.get('/api/v1/titles/').json()['results'][0]['id']
+        with django_assert_num_queries(2):
+            client.get(f'/api/v1/titles/{title_id}/')
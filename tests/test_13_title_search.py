@@ -0,0 +1,48 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test13TitleSearch:
+    url = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.url, {'q': query})
+        assert response.status_code == 200, (
+            f'Проверьте, что GET запрос `{self.url}?q=` возвращает статус 200'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_search_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert self.search(client, 'поворот') == [titles[0]['id']], (
+            f'Проверьте, что GET запрос `{self.url}?q=` ищет по названию '
+            'произведения без учёта регистра'
+        )
+        assert self.search(client, 'драма') == [titles[1]['id']], (
+            f'Проверьте, что GET запрос `{self.url}?q=` ищет по описанию '
+            'произведения'
+        )
+        assert self.search(client, 'пов') == [titles[0]['id']]
+        assert self.search(client, 'нечто') == []
+        assert self.search(client, '"*') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_search_relevance(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.url}{titles[0]["id"]}/',
+            data={'description': 'Проект года'}
+        )
+        assert self.search(client, 'проект') == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что совпадение в названии ранжируется выше '
+            'совпадения в описании и индекс обновляется при изменении'
+        )
+
+        admin_client.delete(f'{self.url}{titles[1]["id"]}/')
+        assert self.search(client, 'проект') == [titles[0]['id']], (
+            'Проверьте, что удалённое произведение исчезает из поиска'
+        )
@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return ' | '.join(row[3] for row in cursor.fetchall())
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Проверяется план запроса SQLite'
+)
+class Test14Indexes:
+
+    def assert_index(self, queryset, index, description):
+        plan = query_plan(queryset)
+        assert index in plan, (
+            f'Проверьте, что {description} использует индекс `{index}`. '
+            f'План запроса: {plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            f'Проверьте, что {description} не сортирует строки во временной '
+            f'таблице. План запроса: {plan}'
+        )
+
+    @pytest.mark.django_db
+    def test_01_reviews_by_title(self):
+        from reviews.models import Review
+
+        self.assert_index(
+            Review.objects.filter(title_id=1).order_by('-pub_date', '-id'),
+            'review_title_pub_date_idx', 'список отзывов произведения'
+        )
+
+    @pytest.mark.django_db
+    def test_02_comments_by_review(self):
+        from reviews.models import Comment
+
+        self.assert_index(
+            Comment.objects.filter(review_id=1).order_by('-pub_date', '-id'),
+            'comment_review_pub_date_idx', 'список комментариев к отзыву'
+        )
+
+    @pytest.mark.django_db
+    def test_03_titles_by_genre(self):
+        from reviews.models import Title
+
+        self.assert_index(
+            Title.objects.filter(genre__slug='drama'),
+            'titlegenre_genre_title_idx', 'фильтр произведений по жанру'
+        )
+
+    @pytest.mark.django_db
+    def test_04_titles_by_category_and_year(self):
+        from reviews.models import Title
+
+        self.assert_index(
+            Title.objects.filter(category__slug='movie', year=2000),
+            'title_category_year_idx',
+            'фильтр произведений по категории и году'
+        )
+        self.assert_index(
+            Title.objects.filter(year=2000), 'title_year_idx',
+            'фильтр произведений по году'
+        )
+
+    @pytest.mark.django_db
+    def test_05_review_author_title(self):
+        from reviews.models import Review
+
+        plan = query_plan(Review.objects.filter(author_id=1, title_id=1))
+        assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan, (
+            'Проверьте, что проверка уникальности отзыва автора на '
+            f'произведение использует индекс. План запроса: {plan}'
+        )
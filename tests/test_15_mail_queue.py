@@ -0,0 +1,99 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connected = False
+
+    def open(self):
+        if self.connected:
+            return False
+        self.connected = True
+        CountingBackend.opened += 1
+        return True
+
+    def close(self):
+        self.connected = False
+
+
+class Test15MailQueue:
+    url_signup = '/api/v1/auth/signup/'
+    data = {'email': 'queued@yamdb.fake', 'username': 'queued'}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues_mail(self, client):
+        from reviews.models import MAIL_PENDING, MAIL_SENT, OutgoingMail
+
+        outbox_before_count = len(mail.outbox)
+        response = client.post(self.url_signup, data=self.data)
+        assert response.status_code == 200
+        assert len(mail.outbox) == outbox_before_count, (
+            f'Проверьте, что запрос `{self.url_signup}` не отправляет письмо '
+            'синхронно, а ставит его в очередь'
+        )
+        queued = OutgoingMail.objects.get(recipient=self.data['email'])
+        assert queued.status == MAIL_PENDING
+
+        call_command('send_mail_queue', '--once', stdout=StringIO())
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_mail_queue` доставляет письма '
+            'из очереди'
+        )
+        assert self.data['email'] in mail.outbox[-1].to
+        queued.refresh_from_db()
+        assert queued.status == MAIL_SENT and queued.sent_at is not None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_failed_delivery_retried(self, client, settings):
+        from reviews.models import MAIL_FAILED, MAIL_PENDING, OutgoingMail
+
+        client.post(self.url_signup, data=self.data)
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        settings.MAIL_QUEUE_MAX_ATTEMPTS = 2
+        settings.MAIL_QUEUE_RETRY_DELAY = 0
+
+        call_command('send_mail_queue', '--once', stdout=StringIO())
+        queued = OutgoingMail.objects.get(recipient=self.data['email'])
+        assert (queued.status, queued.attempts) == (MAIL_PENDING, 1), (
+            'Проверьте, что письмо с ошибкой доставки остаётся в очереди '
+            'для повторной попытки'
+        )
+        assert 'SMTP' in queued.last_error
+
+        call_command('send_mail_queue', '--once', stdout=StringIO())
+        queued.refresh_from_db()
+        assert (queued.status, queued.attempts) == (MAIL_FAILED, 2), (
+            'Проверьте, что после исчерпания попыток письмо помечается '
+            'как недоставленное'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_connection_per_worker(self, settings):
+        from reviews.mailqueue import drain, enqueue_mail
+        from reviews.models import MAIL_SENT, OutgoingMail
+
+        settings.EMAIL_BACKEND = f'{__name__}.CountingBackend'
+        CountingBackend.opened = 0
+        enqueue_mail('Тема', 'Текст', 'robot@yamdb-team.ru', [
+            f'user{number}@yamdb.fake' for number in range(10)
+        ])
+        assert drain(batch_size=10, workers=2) == (10, 0)
+        assert CountingBackend.opened == 2, (
+            'Проверьте, что каждый поток отправки открывает одно соединение '
+            'с почтовым сервером на свою часть пачки'
+        )
+        assert OutgoingMail.objects.filter(status=MAIL_SENT).count() == 10
@@ -0,0 +1,54 @@
+import pytest
+
+
+class Test16AuthCache:
+    url_me = '/api/v1/users/me/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_user_cached(self, user_client, django_assert_num_queries):
+        user_client.get(self.url_me)
+        with django_assert_num_queries(0):
+            response = user_client.get(self.url_me)
+        assert response.status_code == 200, (
+            'Проверьте, что повторный запрос с тем же токеном не обращается '
+            'к таблице пользователей'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidated_on_save(self, user_client, admin_client, user):
+        user_client.get(self.url_me)
+        user_client.patch(self.url_me, data={'bio': 'новое описание'})
+        assert user_client.get(self.url_me).json()['bio'] == 'новое описание', (
+            f'Проверьте, что после PATCH запроса `{self.url_me}` '
+            'пользователь в кеше аутентификации обновляется'
+        )
+
+        assert user_client.get('/api/v1/users/').status_code == 403
+        admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'admin'}
+        )
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что смена роли пользователя администратором '
+            'сразу учитывается в правах доступа'
+        )
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert user_client.get(self.url_me).status_code == 401, (
+            'Проверьте, что удалённый пользователь не аутентифицируется '
+            'по закешированной записи'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_patch_keeps_fresh_fields(self, user_client, user):
+        from reviews.models import User
+
+        user_client.get(self.url_me)
+        # Изменение мимо сигналов: кеш держит прежнюю копию пользователя.
+        User.objects.filter(pk=user.pk).update(role='moderator')
+        response = user_client.patch(self.url_me, data={'bio': 'описание'})
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert (user.role, user.bio) == ('moderator', 'описание'), (
+            f'Проверьте, что PATCH запрос `{self.url_me}` не перезаписывает '
+            'поля пользователя значениями из кеша аутентификации'
+        )
@@ -0,0 +1,96 @@
+import pytest
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test17ConditionalGet:
+
+    def assert_not_modified(self, client, url, django_assert_num_queries):
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response.has_header('Last-Modified'), (
+            f'Проверьте, что ответ на GET запрос `{url}` содержит заголовки '
+            '`ETag` и `Last-Modified`'
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            f'Проверьте, что GET запрос `{url}` с совпадающим '
+            '`If-None-Match` возвращает статус 304 без запросов к базе'
+        )
+        return etag
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles(self, client, admin_client, django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        list_url = '/api/v1/titles/'
+        detail_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        list_etag = self.assert_not_modified(
+            client, list_url, django_assert_num_queries
+        )
+        detail_etag = self.assert_not_modified(
+            client, detail_url, django_assert_num_queries
+        )
+        assert list_etag != detail_etag
+
+        user, _ = create_users_api(admin_client)
+        auth_client(user).post(
+            f'{detail_url}reviews/', data={'text': 'Отзыв', 'score': 7}
+        )
+        response = client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag произведения, '
+            'ведь меняется его рейтинг'
+        )
+        assert response.json()['rating'] == 7
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_genres_and_categories(
+            self, client, admin_client, django_assert_num_queries):
+        create_titles(admin_client)
+        for url, data in (
+                ('/api/v1/genres/', {'name': 'Сказка', 'slug': 'tale'}),
+                ('/api/v1/categories/', {'name': 'Музыка', 'slug': 'music'})):
+            etag = self.assert_not_modified(
+                client, url, django_assert_num_queries
+            )
+            admin_client.post(url, data=data)
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                f'Проверьте, что после POST запроса `{url}` меняется ETag '
+                'списка'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_versions_in_shared_cache(self, client, admin_client, settings):
+        from django.core.cache import caches
+
+        from api.cache import TABLE_VERSION_KEY, new_version
+
+        create_titles(admin_client)
+        url = '/api/v1/genres/'
+        etag = client.get(url)['ETag']
+        # Так версию меняет другой процесс с тем же общим кешем.
+        caches[settings.VERSION_CACHE].set(
+            TABLE_VERSION_KEY.format('genres'), new_version()
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что версии для ETag хранятся в общем кеше '
+            'VERSION_CACHE'
+        )
+
+    def test_04_local_version_cache_warning(self, settings):
+        from api.checks import check_version_cache
+
+        assert [error.id for error in check_version_cache(None)] == [
+            'api.W001'
+        ], (
+            'Проверьте, что проверка --deploy предупреждает о кеше версий '
+            'в памяти процесса'
+        )
+        settings.CACHES = {**settings.CACHES, 'shared': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/tmp/api_yamdb_shared',
+        }}
+        assert check_version_cache(None) == []
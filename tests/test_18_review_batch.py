@@ -0,0 +1,129 @@
+import pytest
+from rest_framework.test import APIClient
+
+from .common import auth_client, create_titles, create_users_api
+
+
+class Test18ReviewBatch:
+    url = '/api/v1/reviews/batch/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_batch_not_auth(self):
+        response = APIClient().post(self.url, data=[], format='json')
+        assert response.status_code == 401, (
+            f'Проверьте, что POST запрос `{self.url}` без токена '
+            'возвращает статус 401'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batch_create(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        user, _ = create_users_api(admin_client)
+        client_user = auth_client(user)
+        client_user.post(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/',
+            data={'text': 'Уже есть', 'score': 2}
+        )
+        data = [
+            {'title': titles[0]['id'], 'text': 'Отлично', 'score': 9},
+            {'title': titles[0]['id'], 'text': 'Повтор', 'score': 1},
+            {'title': titles[1]['id'], 'text': 'Второй', 'score': 5},
+            {'title': 999999, 'text': 'Нет такого', 'score': 5},
+            {'title': titles[1]['id'], 'text': 'Плохая оценка', 'score': 11},
+        ]
+        response = client_user.post(self.url, data=data, format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что POST запрос `{self.url}` со списком отзывов '
+            'возвращает статус 200'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            'created', 'error', 'error', 'error', 'error'
+        ], (
+            f'Проверьте, что POST запрос `{self.url}` возвращает результат '
+            'для каждого отзыва в порядке запроса'
+        )
+        assert 'score' in results[4]['errors']
+        assert 'title' in results[3]['errors']
+
+        review = client_user.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{results[0]["id"]}/'
+        ).json()
+        assert review['text'] == 'Отлично' and review['author'] == user.username
+        title = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['rating'] == 9, (
+            'Проверьте, что пакетное добавление отзывов обновляет '
+            'рейтинг произведений'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_batch_queries(
+            self, admin_client, user_client, django_assert_max_num_queries):
+        from reviews.models import Title
+
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=2000, description='')
+            for i in range(50)
+        )
+        data = [
+            {'title': title_id, 'text': 'Отзыв', 'score': 5}
+            for title_id in Title.objects.values_list('pk', flat=True)
+        ]
+        with django_assert_max_num_queries(14):
+            response = user_client.post(self.url, data=data, format='json')
+        assert all(result['status'] == 'created'
+                   for result in response.json())
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_batch_concurrent_review(
+            self, admin_client, user_client, user, monkeypatch):
+        from api import views
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        build = views.build_batch_reviews
+
+        def build_then_post(*args):
+            reviews = build(*args)
+            # Отзыв от параллельного POST после проверки на дубликаты.
+            Review.objects.create(
+                title_id=titles[1]['id'], author=user, text='Раньше',
+                score=3
+            )
+            return reviews
+
+        monkeypatch.setattr(views, 'build_batch_reviews', build_then_post)
+        response = user_client.post(self.url, data=[
+            {'title': titles[0]['id'], 'text': 'Первый', 'score': 8},
+            {'title': titles[1]['id'], 'text': 'Второй', 'score': 5},
+        ], format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что POST запрос `{self.url}` не падает, если '
+            'параллельный запрос уже создал один из отзывов'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            'created', 'error'
+        ]
+        assert 'non_field_errors' in results[1]['errors']
+        title = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title['rating'] == 8
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_batch_title_out_of_range(self, user_client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = user_client.post(self.url, data=[
+            {'title': 10 ** 20, 'text': 'Огромный', 'score': 5},
+            {'title': 0, 'text': 'Нулевой', 'score': 5},
+            {'title': titles[0]['id'], 'text': 'Настоящий', 'score': 5},
+        ], format='json')
+        assert response.status_code == 200, (
+            f'Проверьте, что POST запрос `{self.url}` с id произведения '
+            'вне диапазона INTEGER не падает'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            'error', 'error', 'created'
+        ]
+        assert 'title' in results[0]['errors']
+        assert 'title' in results[1]['errors']
@@ -0,0 +1,57 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import create_comments
+
+
+class Test19Export:
+
+    def read(self, response):
+        body = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in body.splitlines()]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_reviews(self, client, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin
+        )
+        url = '/api/v1/export/reviews/'
+        assert client.get(url).status_code == 401, (
+            f'Проверьте, что GET запрос `{url}` без токена возвращает 401'
+        )
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = self.read(response)
+        assert [row['id'] for row in rows] == [r['id'] for r in reviews], (
+            f'Проверьте, что GET запрос `{url}` выгружает все отзывы '
+            'по одному JSON-объекту в строке'
+        )
+        assert rows[1]['author'] == user.username
+        assert rows[1]['title_id'] == titles[0]['id']
+        assert set(rows[0]) == {
+            'id', 'title_id', 'text', 'score', 'pub_date', 'author'
+        }
+
+        rows = self.read(admin_client.get(f'{url}?since=2999-01-01'))
+        assert rows == [], (
+            f'Проверьте, что GET запрос `{url}?since=` отбирает записи '
+            'по дате публикации'
+        )
+        assert admin_client.get(f'{url}?since=вчера').status_code == 400
+
+        rows = self.read(admin_client.get('/api/v1/export/comments/'))
+        assert [row['id'] for row in rows] == [c['id'] for c in comments]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_command(self, admin_client, admin):
+        _, reviews, _, _, _ = create_comments(admin_client, admin)
+        out = StringIO()
+        call_command('export', 'reviews', '--since', '2000-01-01', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [row['id'] for row in rows] == [r['id'] for r in reviews], (
+            'Проверьте, что команда `export` выгружает отзывы в NDJSON'
+        )
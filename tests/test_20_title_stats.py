@@ -0,0 +1,120 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+def histogram(**counts):
+    return {str(score): counts.get(f's{score}', 0) for score in range(1, 11)}
+
+
+class Test20TitleStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats_follow_reviews(self, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        response = admin_client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что `{url}` доступен и возвращает статус 200'
+        )
+        stats = response.json()
+        assert stats['count'] == 3 and stats['histogram'] == histogram(
+            s3=1, s4=1, s5=1
+        ), (
+            f'Проверьте, что `{url}` возвращает число отзывов '
+            'и распределение их оценок'
+        )
+        assert stats['latest_pub_date'] is not None
+
+        title = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/').json()
+        assert title.get('stats') == stats, (
+            'Проверьте, что статистика выводится в карточке произведения'
+        )
+        empty = admin_client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/stats/'
+        ).json()
+        assert empty == {
+            'count': 0, 'histogram': histogram(), 'latest_pub_date': None
+        }, 'Проверьте, что у произведения без отзывов статистика пустая'
+
+        auth_client(user).patch(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9}
+        )
+        stats = admin_client.get(url).json()
+        assert stats['histogram'] == histogram(s4=1, s5=1, s9=1), (
+            'Проверьте, что при изменении оценки отзыва '
+            'обновляется распределение оценок'
+        )
+
+        admin_client.delete(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        )
+        stats = admin_client.get(url).json()
+        assert stats['count'] == 2 and stats['histogram'] == histogram(
+            s4=1, s9=1
+        ), (
+            'Проверьте, что при удалении отзыва '
+            'обновляется распределение оценок'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_stats_not_found(self, admin_client):
+        response = admin_client.get('/api/v1/titles/999/stats/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rebuild_title_stats(self, admin_client, admin):
+        from reviews.models import Review, TitleStats
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        expected = {
+            stats.pk: (stats.histogram, stats.count, stats.latest_pub_date)
+            for stats in TitleStats.objects.all()
+        }
+        TitleStats.objects.all().delete()
+        call_command('rebuild_title_stats', stdout=StringIO())
+
+        rebuilt = {
+            stats.pk: (stats.histogram, stats.count, stats.latest_pub_date)
+            for stats in TitleStats.objects.all()
+        }
+        assert rebuilt == expected, (
+            'Проверьте, что команда `rebuild_title_stats` восстанавливает '
+            'статистику всех произведений'
+        )
+        latest = Review.objects.filter(
+            title=titles[0]['id']
+        ).order_by('-pub_date')[0].pub_date
+        assert rebuilt[titles[0]['id']][2] == latest
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_stats_after_cascade(self, admin_client, admin):
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        stats = admin_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/stats/'
+        ).json()
+        assert stats['count'] == 2 and stats['histogram'] == histogram(
+            s4=1, s5=1
+        ), (
+            'Проверьте, что статистика обновляется при каскадном удалении '
+            'отзывов вместе с автором'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_missing_stats_rebuilt(self, admin_client, admin):
+        from reviews.models import TitleStats
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        TitleStats.objects.filter(pk=titles[0]['id']).delete()
+        response = admin_client.get(f'/api/v1/titles/{titles[0]["id"]}/stats/')
+        assert response.status_code == 200, (
+            'Проверьте, что статистика произведения без строки статистики '
+            'строится заново, а не возвращается 404'
+        )
+        assert response.json()['histogram'] == histogram(s3=1, s4=1, s5=1)
@@ -0,0 +1,46 @@
+import pytest
+
+from .common import create_reviews
+
+
+class Test21NestedResources:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_comment_create_queries(
+            self, admin_client, admin, django_assert_num_queries):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        admin_client.get(url)
+        with django_assert_num_queries(2):
+            response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201, (
+            f'Проверьте, что POST запрос `{url}` создаёт комментарий, '
+            'находя отзыв и произведение одним запросом к базе'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_review_of_other_title(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        response = admin_client.get(url)
+        assert response.status_code == 404, (
+            f'Проверьте, что GET запрос `{url}` возвращает 404, если отзыв '
+            'не относится к произведению из адреса'
+        )
+        response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 404, (
+            f'Проверьте, что POST запрос `{url}` возвращает 404, если отзыв '
+            'не относится к произведению из адреса'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_review_update(self, admin_client, admin):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        response = admin_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == 200, (
+            f'Проверьте, что PATCH запрос `{url}` не считает изменяемый '
+            'отзыв повторным'
+        )
@@ -0,0 +1,145 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+class Test22Replicas:
+    url = '/api/v1/genres/'
+
+    def slugs(self, client):
+        return [genre['slug'] for genre in client.get(self.url).json()['results']]
+
+    def test_01_safe_requests_read_replica(self, replicas, admin_client):
+        from reviews.models import Genre
+
+        Genre.objects.create(name='Драма', slug='drama')
+        client = APIClient()
+        assert self.slugs(client) == [], (
+            f'Проверьте, что GET запрос `{self.url}` читает из реплики, '
+            'а не из основной базы'
+        )
+        replicas.sync()
+        assert self.slugs(client) == ['drama'], (
+            f'Проверьте, что GET запрос `{self.url}` видит данные, '
+            'попавшие в реплику'
+        )
+
+    def test_02_read_after_write(self, replicas, admin_client):
+        replicas.sync()
+        response = admin_client.post(
+            self.url, data={'name': 'Драма', 'slug': 'drama'}
+        )
+        assert response.status_code == 201
+        assert self.slugs(admin_client) == ['drama'], (
+            'Проверьте, что после записи клиент читает из основной базы'
+        )
+        assert self.slugs(APIClient()) == [], (
+            'Проверьте, что другие клиенты продолжают читать из реплики'
+        )
+
+    def test_03_writes_go_to_primary(self, replicas):
+        from django.db import router
+        from reviews.models import Genre
+
+        assert router.db_for_write(Genre) == 'default'
+        assert router.db_for_read(Genre) == 'default'
+        assert not router.allow_migrate('replica1', 'reviews')
+
+    def test_04_pin_in_shared_cache(self, replicas, admin_client):
+        from django.core.cache import cache
+
+        replicas.sync()
+        admin_client.post(self.url, data={'name': 'Драма', 'slug': 'drama'})
+        # Локальный кеш процесса не хранит отметку о записи.
+        cache.clear()
+        assert self.slugs(admin_client) == ['drama'], (
+            'Проверьте, что отметка о записи клиента хранится в общем кеше '
+            'DATABASE_REPLICA_PIN_CACHE'
+        )
+
+    def test_05_replica_reads_not_cached(self, replicas, admin_client):
+        from reviews.models import Review, Title, User
+
+        title = Title.objects.create(name='Фильм', year=2000)
+        replicas.sync()
+        Review.objects.create(
+            title=title, text='Отзыв', score=5,
+            author=User.objects.create(username='author', email='a@yamdb.fake')
+        )
+        client = APIClient()
+        response = client.get(self.url)
+        assert response.status_code == 200 and 'ETag' not in response, (
+            'Проверьте, что ответ из реплики не получает ETag: реплика '
+            'может отставать от версии кеша'
+        )
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        assert client.get(url).json()['count'] == 0
+        replicas.sync()
+        assert client.get(url).json()['count'] == 1, (
+            'Проверьте, что страница отзывов из отстающей реплики '
+            'не попадает в кеш'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_without_replicas(self, client):
+        from reviews.models import Genre
+
+        Genre.objects.create(name='Драма', slug='drama')
+        assert self.slugs(client) == ['drama'], (
+            'Проверьте, что без настроенных реплик чтение идёт '
+            'из основной базы'
+        )
+
+    def test_07_caught_up_replica_reads_cached(self, replicas, settings):
+        from reviews.models import Review, Title, User
+
+        title = Title.objects.create(name='Фильм', year=2000)
+        other = Title.objects.create(name='Другой фильм', year=2000)
+        review = Review.objects.create(
+            title=title, text='Отзыв', score=5,
+            author=User.objects.create(username='author', email='a@yamdb.fake')
+        )
+        replicas.sync()
+        # Last-Modified округляется вверх до секунды.
+        settings.DATABASE_REPLICA_MAX_LAG = -1
+        client = APIClient()
+        response = client.get(self.url)
+        assert response.status_code == 200 and 'ETag' in response, (
+            'Проверьте, что ответ из реплики получает ETag, если версии '
+            'данных сменились раньше DATABASE_REPLICA_MAX_LAG секунд'
+        )
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        assert client.get(url).json()['count'] == 1
+        # update() не вызывает сигналов и не меняет версию страницы.
+        Review.objects.filter(pk=review.pk).update(title=other)
+        replicas.sync()
+        assert client.get(url).json()['count'] == 1, (
+            'Проверьте, что страница отзывов из догнавшей реплики '
+            'попадает в кеш'
+        )
+
+
+class Test22ReplicaSelection:
+
+    def test_01_round_robin(self):
+        from api_yamdb.replicas import RoundRobin
+
+        selector = RoundRobin()
+        aliases = ['replica1', 'replica2']
+        assert [selector.choose(aliases) for _ in range(4)] == [
+            'replica1', 'replica2', 'replica1', 'replica2'
+        ]
+
+    def test_02_least_latency(self):
+        from api_yamdb.replicas import LeastLatency
+
+        selector = LeastLatency()
+        aliases = ['replica1', 'replica2']
+        selector.observe('replica1', 0.05)
+        selector.observe('replica2', 0.01)
+        chosen = [selector.choose(aliases)
+                  for _ in range(selector.explore_every * 2)]
+        assert chosen.count('replica2') == len(chosen) - 1, (
+            'Проверьте, что least_latency выбирает самую быструю реплику, '
+            'лишь изредка проверяя остальные'
+        )
+        assert chosen.count('replica1') == 1
@@ -0,0 +1,73 @@
+import pytest
+
+from .common import create_titles
+
+
+@pytest.fixture
+def metrics_on(settings):
+    from api_yamdb.metrics import request_metrics
+
+    settings.REQUEST_METRICS = True
+    request_metrics.clear()
+    yield request_metrics
+    request_metrics.clear()
+
+
+class Test23RequestMetrics:
+    url = '/api/v1/_metrics'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_server_timing(self, client, metrics_on):
+        response = client.get('/api/v1/titles/')
+        header = response.get('Server-Timing', '')
+        assert header.startswith('db;dur=') and 'total;dur=' in header, (
+            'Проверьте, что при включённых замерах ответ содержит '
+            'заголовок `Server-Timing`'
+        )
+        assert 'desc="1 queries"' in header, (
+            'Проверьте, что в `Server-Timing` указано число запросов к базе'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_metrics_endpoint(
+            self, client, user_client, admin_client, metrics_on):
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        client.post('/api/v1/auth/signup/', data={})
+        assert user_client.get(self.url).status_code == 403, (
+            f'Проверьте, что `{self.url}` доступен только администратору'
+        )
+        response = admin_client.get(self.url)
+        assert response.status_code == 200
+        data = response.json()
+        assert data.get('TitleViewSet.list', {}).get('count') == 2, (
+            f'Проверьте, что `{self.url}` группирует замеры по view '
+            'и действию'
+        )
+        assert 'signup.post' in data
+        summary = data['TitleViewSet.list']
+        assert summary['mean_queries'] == 1
+        assert sum(summary['buckets'].values()) == 2
+        assert set(summary['mean_ms']) == {'view', 'db', 'serialize', 'render'}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_serialize_timing(self, client, admin_client, metrics_on):
+        titles, _, _ = create_titles(admin_client)
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/'):
+            header = client.get(url)['Server-Timing']
+            timings = dict(
+                part.split(';dur=') for part in
+                (item.split(';desc=')[0] for item in header.split(', '))
+            )
+            assert 0 < float(timings['serialize']) <= float(timings['view']), (
+                'Проверьте, что в `Server-Timing` есть время сериализации '
+                f'ответа `{url}`, входящее во время view'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_disabled_by_default(self, client):
+        response = client.get('/api/v1/titles/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что без настройки `REQUEST_METRICS` замеры '
+            'не выполняются'
+        )
@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def slowlog(settings):
+    from api_yamdb.slowlog import buffer
+
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    # Запись только по явному flush(): фоновый поток не запускается.
+    settings.SLOW_QUERY_FLUSH_SECONDS = None
+    buffer.clear()
+    yield buffer
+    buffer.clear()
+
+
+class Test24SlowQueries:
+
+    def test_01_fingerprint(self):
+        from api_yamdb.slowlog import fingerprint
+
+        first = fingerprint(
+            'SELECT "id" FROM "t" WHERE "name" = \'a\' AND "id" IN (1, 2, 3)'
+        )
+        second = fingerprint(
+            'SELECT "id" FROM "t"  WHERE "name" = \'b\' AND "id" IN (%s)'
+        )
+        assert first == second, (
+            'Проверьте, что запросы одной формы с разными литералами '
+            'получают одинаковый отпечаток'
+        )
+        assert first[1] == (
+            'SELECT "id" FROM "t" WHERE "name" = ? AND "id" IN (...)'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_capture_with_plan(self, client, settings, slowlog):
+        from api_yamdb.models import SlowQuery
+
+        client.get('/api/v1/titles/', {'genre': 'drama', 'limit': 5})
+        assert not SlowQuery.objects.exists(), (
+            'Проверьте, что на пути запроса медленные запросы только '
+            'копятся в памяти, без записи в журнал'
+        )
+        slowlog.flush()
+        entries = SlowQuery.objects.filter(view='TitleViewSet.list')
+        assert entries.exists(), (
+            'Проверьте, что запросы дольше порога попадают в журнал '
+            'вместе с view, из которого выполнены'
+        )
+        assert all(entry.plan for entry in entries), (
+            'Проверьте, что для медленного SELECT сохраняется план выполнения'
+        )
+
+        settings.SLOW_QUERY_THRESHOLD_MS = None
+        slowlog.clear()
+        client.get('/api/v1/titles/')
+        assert slowlog.flush() == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_ring_buffer(self, client, settings, slowlog):
+        from api_yamdb.models import SlowQuery
+
+        settings.SLOW_QUERY_LOG_SIZE = 3
+        for _ in range(3):
+            client.get('/api/v1/titles/')
+            slowlog.flush()
+        assert SlowQuery.objects.count() <= 3, (
+            'Проверьте, что журнал хранит не больше '
+            '`SLOW_QUERY_LOG_SIZE` записей'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_command(self, client, settings, slowlog):
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        settings.SLOW_QUERY_THRESHOLD_MS = None
+        out = StringIO()
+        call_command('slowqueries', stdout=out)
+        assert 'TitleViewSet.list' in out.getvalue(), (
+            'Проверьте, что команда `slowqueries` выводит сводку '
+            'по медленным запросам'
+        )
+        call_command('slowqueries', '--clear', stdout=StringIO())
+        out = StringIO()
+        call_command('slowqueries', stdout=out)
+        assert 'нет' in out.getvalue()
+
+    @pytest.mark.parametrize('value, expected', (
+        (None, 'None'), ('', 'None'), ('250', '250.0'),
+    ))
+    def test_05_threshold_setting(self, value, expected):
+        env = dict(os.environ)
+        env.pop('SLOW_QUERY_MS', None)
+        if value is not None:
+            env['SLOW_QUERY_MS'] = value
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'from api_yamdb import settings; '
+             'print(settings.SLOW_QUERY_THRESHOLD_MS)'],
+            cwd=os.path.join(os.path.dirname(__file__), '..', 'api_yamdb'),
+            env=env, capture_output=True, text=True,
+        )
+        assert result.stdout.strip() == expected, (
+            'Проверьте, что журнал медленных запросов выключен без '
+            '`SLOW_QUERY_MS` или с пустым значением'
+        )
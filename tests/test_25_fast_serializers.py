@@ -0,0 +1,64 @@
+import pytest
+
+from .common import create_comments
+
+
+class Test25FastSerializers:
+
+    def render(self, data):
+        from rest_framework.renderers import JSONRenderer
+
+        return JSONRenderer().render(data)
+
+    def check_parity(self, serializer_class, fast, queryset, name):
+        expected = self.render(serializer_class(queryset, many=True).data)
+        fast_data = fast.serialize(list(fast.values(queryset)))
+        assert self.render(fast_data) == expected, (
+            f'Проверьте, что быстрый сериализатор {name} выдаёт те же байты, '
+            'что и ModelSerializer'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_parity(self, admin_client, admin):
+        from api.fast_serializers import (CommentValuesSerializer,
+                                          ReviewValuesSerializer,
+                                          TitleValuesSerializer)
+        from api.serializers import (CommentSerializer, ReviewSerializer,
+                                     TitleSerializer)
+        from reviews.models import Comment, Review, Title, TitleStats
+
+        create_comments(admin_client, admin)
+        Title.objects.create(name='Без категории', year=2001, description='')
+        Title.objects.bulk_create([
+            Title(name='Без статистики', year=2002, description='«’» ')
+        ])
+        assert Title.objects.count() > TitleStats.objects.count()
+
+        titles = (Title.objects.select_related('category', 'stats')
+                  .prefetch_related('genre').order_by('id'))
+        self.check_parity(
+            TitleSerializer, TitleValuesSerializer(), titles, 'произведений'
+        )
+        reviews = Review.objects.order_by('-pub_date', '-id')
+        self.check_parity(
+            ReviewSerializer, ReviewValuesSerializer(), reviews, 'отзывов'
+        )
+        comments = Comment.objects.order_by('-pub_date', '-id')
+        self.check_parity(
+            CommentSerializer, CommentValuesSerializer(), comments,
+            'комментариев'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_keyset_with_values(self, admin_client, admin):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.get(url, {'cursor': '', 'limit': 2})
+        data = response.json()
+        assert len(data['results']) == 2 and data['next'], (
+            f'Проверьте, что keyset-пагинация `{url}` работает со строками '
+            'быстрого сериализатора'
+        )
+        rest = admin_client.get(data['next']).json()['results']
+        ids = [review['id'] for review in data['results'] + rest]
+        assert sorted(ids) == sorted(review['id'] for review in reviews)
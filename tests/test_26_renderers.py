@@ -0,0 +1,73 @@
+import datetime
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+
+def payloads():
+    moment = datetime.datetime(2022, 11, 10, 14, 35, 7, 123456)
+    return [
+        OrderedDict([
+            ('count', 2),
+            ('next', None),
+            ('results', [{
+                'id': 1,
+                'text': 'Отзыв с   и  , "кавычками" и \\ \n\t\x01',
+                'score': 10,
+                'pub_date': timezone.make_aware(moment, timezone.utc),
+                'rating': 7.5,
+            }, {
+                'id': 2,
+                'pub_date': moment,
+                'date': moment.date(),
+                'time': moment.time(),
+                'rating': Decimal('4.25'),
+                'average': 4.333333333333333,
+                'uuid': uuid.UUID(int=1),
+                'detail': gettext_lazy('Not found.'),
+                'flags': [True, False, None],
+            }]),
+        ]),
+        {'big': 2 ** 70, 'nested': [[], {}]},
+        {1: 'нестроковый ключ'},
+        [],
+    ]
+
+
+class Test26Renderers:
+
+    @pytest.mark.parametrize('backend', ['orjson', 'json'])
+    def test_01_parity(self, backend, monkeypatch):
+        from api import renderers
+        from rest_framework.renderers import JSONRenderer
+
+        if backend == 'json':
+            monkeypatch.setattr(renderers, 'orjson', None)
+        for data in payloads():
+            assert (renderers.FastJSONRenderer().render(data)
+                    == JSONRenderer().render(data)), (
+                'Проверьте, что FastJSONRenderer выдаёт те же байты, '
+                'что и JSONRenderer'
+            )
+        assert renderers.FastJSONRenderer().render(None) == b''
+
+    def test_02_indent(self):
+        from api.renderers import FastJSONRenderer
+        from rest_framework.renderers import JSONRenderer
+
+        data = payloads()[0]
+        media_type = 'application/json; indent=4'
+        assert (FastJSONRenderer().render(data, media_type)
+                == JSONRenderer().render(data, media_type))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_default_renderer(self, client):
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json', (
+            'Проверьте, что ответы API по умолчанию отдаются в JSON'
+        )
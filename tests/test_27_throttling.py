@@ -0,0 +1,128 @@
+import pytest
+
+
+class Test27Throttling:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    def test_01_grant(self):
+        from api.throttling import grant
+
+        granted, tat = grant(None, 100.0, 5, 12.0, 5)
+        assert granted == 5 and tat == 160.0
+        assert grant(tat, 100.0, 5, 12.0, 1)[0] == 0, (
+            'Проверьте, что из пустого ведра токены не выдаются'
+        )
+        assert grant(tat, 112.0, 5, 12.0, 3)[0] == 1, (
+            'Проверьте, что ведро пополняется по токену за интервал'
+        )
+        assert grant(tat, 1000.0, 5, 12.0, 10)[0] == 5, (
+            'Проверьте, что ведро не копит токены сверх ёмкости'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_signup_by_email(self, client):
+        for number in range(5):
+            client.post(self.url_signup, data={
+                'username': f'user{number}', 'email': 'same@yamdb.fake'
+            })
+        response = client.post(self.url_signup, data={
+            'username': 'another', 'email': 'SAME@yamdb.fake'
+        })
+        assert response.status_code == 429, (
+            f'Проверьте, что POST запросы `{self.url_signup}` ограничены '
+            'по email'
+        )
+        response = client.post(self.url_signup, data={
+            'username': 'another', 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_token_by_username(self, client, user):
+        data = {'username': user.username, 'confirmation_code': 'invalid'}
+        statuses = [client.post(self.url_token, data=data).status_code
+                    for _ in range(6)]
+        assert statuses == [400] * 5 + [429], (
+            f'Проверьте, что попытки подобрать код в `{self.url_token}` '
+            'ограничены по username'
+        )
+        assert 'Retry-After' in client.post(self.url_token, data=data)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_by_ip(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'auth_ip': '3/min'},
+        }
+        statuses = [
+            client.post(self.url_token, data={
+                'username': f'user{number}', 'confirmation_code': 'x'
+            }).status_code
+            for number in range(4)
+        ]
+        assert statuses == [404] * 3 + [429], (
+            'Проверьте, что запросы с одного IP ограничены'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_cache_store_leases(self, client, settings):
+        from django.core.cache import cache
+
+        from api.throttling import get_bucket_store
+
+        settings.THROTTLE_STORE = 'api.throttling.CacheBucketStore'
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'auth_ip': '10/min'},
+        }
+        get_bucket_store.cache_clear()
+        writes = []
+        original_set = cache.set
+        cache.set = lambda *args, **kwargs: (
+            writes.append(args[0]), original_set(*args, **kwargs)
+        )
+        try:
+            statuses = [
+                client.post(self.url_token, data={}).status_code
+                for _ in range(11)
+            ]
+        finally:
+            del cache.set
+        assert statuses == [400] * 10 + [429], (
+            'Проверьте, что общее хранилище вёдер ограничивает запросы'
+        )
+        assert len(writes) == 5, (
+            'Проверьте, что узел забирает токены из общего хранилища '
+            'пачками, а не по одному на запрос'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_cache_store_small_bucket(self, client, settings):
+        from django.core.cache import cache
+
+        from api.throttling import get_bucket_store
+
+        settings.THROTTLE_STORE = 'api.throttling.CacheBucketStore'
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'auth_ip': '5/min'},
+        }
+        get_bucket_store.cache_clear()
+        writes = []
+        original_set = cache.set
+        cache.set = lambda *args, **kwargs: (
+            writes.append(args[0]), original_set(*args, **kwargs)
+        )
+        try:
+            statuses = [
+                client.post(self.url_token, data={}).status_code
+                for _ in range(6)
+            ]
+        finally:
+            del cache.set
+        assert statuses == [400] * 5 + [429]
+        assert len(writes) == 3, (
+            'Проверьте, что и маленькое ведро расходуется пачками '
+            'не меньше `THROTTLE_MIN_LEASE` токенов'
+        )
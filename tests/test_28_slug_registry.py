@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+
+from .common import create_categories, create_genre
+
+
+class Test28SlugRegistry:
+    url = '/api/v1/titles/'
+
+    def title(self, genres, category, number=0):
+        return {
+            'name': f'Произведение {number}',
+            'year': 2000,
+            'genre': genres,
+            'category': category,
+            'description': 'Описание',
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_no_slug_queries(self, admin_client):
+        genres = [genre['slug'] for genre in create_genre(admin_client)]
+        category = create_categories(admin_client)[0]['slug']
+        admin_client.post(self.url, data=self.title(genres, category))
+
+        statements = []
+
+        def collect(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(collect):
+            response = admin_client.post(
+                self.url, data=self.title(genres, category, 1)
+            )
+        assert response.status_code == 201
+        assert sorted(response.json()['genre']) == sorted(genres)
+        lookups = [sql for sql in statements
+                   if sql.startswith('SELECT') and '"slug" =' in sql]
+        assert not lookups, (
+            f'Проверьте, что POST запрос `{self.url}` находит жанры и '
+            'категорию по slug без запросов к базе'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_refresh_on_write(self, admin_client):
+        category = create_categories(admin_client)[0]['slug']
+        genres = [genre['slug'] for genre in create_genre(admin_client)]
+        admin_client.post(self.url, data=self.title(genres, category))
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Новый', 'slug': 'newgenre'}
+        )
+        response = admin_client.post(
+            self.url, data=self.title(['newgenre'], category, 1)
+        )
+        assert response.status_code == 201, (
+            'Проверьте, что новый жанр сразу доступен при создании '
+            'произведения'
+        )
+
+        admin_client.delete('/api/v1/genres/newgenre/')
+        response = admin_client.post(
+            self.url, data=self.title(['newgenre'], category, 2)
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что удалённый жанр нельзя указать у произведения'
+        )
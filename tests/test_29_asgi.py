@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+
+from .common import create_reviews, create_titles
+
+
+def call(app, method, path, body=b'', headers=(), receive=None,
+         messages=None):
+    """Выполняет запрос к ASGI-приложению, возвращает (статус, тело)."""
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path.split('?')[0],
+        'query_string': path.partition('?')[2].encode(),
+        'headers': [(b'host', b'testserver'), *headers],
+    }
+    sent = messages if messages is not None else []
+
+    async def default_receive():
+        return {'type': 'http.request', 'body': body}
+
+    async def send(message):
+        sent.append(message)
+
+    async def run():
+        await app(scope, receive or default_receive, send)
+        return sent[0]['status'], b''.join(
+            message['body'] for message in sent[1:]
+        )
+
+    return run()
+
+
+class Test29ASGI:
+
+    @pytest.fixture
+    def app(self):
+        from api_yamdb.asgi_handler import ASGIHandler
+
+        handler = ASGIHandler(threads=1)
+        yield handler
+        handler.executor.shutdown()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_read_parity(self, app, admin_client, client):
+        titles, _, _ = create_titles(admin_client)
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/',
+                    '/api/v1/titles/?year=1940'):
+            status, body = asyncio.run(call(app, 'GET', url))
+            assert status == 200
+            assert json.loads(body) == client.get(url).json(), (
+                f'Проверьте, что ASGI-приложение отдаёт `{url}` так же, '
+                'как WSGI'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_write(self, app, token_admin):
+        body = json.dumps({'name': 'Жанр', 'slug': 'asgi'}).encode()
+        status, _ = asyncio.run(call(app, 'POST', '/api/v1/genres/', body, [
+            (b'authorization', f'Bearer {token_admin["access"]}'.encode()),
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ]))
+        assert status == 201, (
+            'Проверьте, что ASGI-приложение передаёт тело и заголовки '
+            'запроса'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_slow_client_holds_no_thread(self, app):
+        async def run():
+            arrived = asyncio.Event()
+
+            async def slow_receive():
+                await arrived.wait()
+                return {'type': 'http.request', 'body': b''}
+
+            slow = asyncio.ensure_future(
+                call(app, 'GET', '/api/v1/titles/', receive=slow_receive)
+            )
+            fast = await asyncio.wait_for(
+                call(app, 'GET', '/api/v1/titles/'), timeout=10
+            )
+            assert not slow.done()
+            arrived.set()
+            return fast, await slow
+
+        fast, slow = asyncio.run(run())
+        assert fast[0] == 200 and slow[0] == 200, (
+            'Проверьте, что клиент, который медленно присылает запрос, '
+            'не занимает поток пула'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_streaming_response(
+            self, app, admin, admin_client, token_admin):
+        create_reviews(admin_client, admin)
+        messages = []
+        status, body = asyncio.run(call(
+            app, 'GET', '/api/v1/export/reviews/', headers=[(
+                b'authorization', f'Bearer {token_admin["access"]}'.encode()
+            )], messages=messages,
+        ))
+        assert status == 200
+        parts = [message for message in messages
+                 if message['type'] == 'http.response.body']
+        assert len(parts) > 1 and all(
+            part['more_body'] for part in parts[:-1]
+        ) and not parts[-1].get('more_body'), (
+            'Проверьте, что ASGI-приложение отправляет ответ частями '
+            '`http.response.body` с `more_body=True`, а не целиком'
+        )
+        assert len(body.splitlines()) == 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_disconnect_frees_thread(
+            self, app, admin, admin_client, token_admin):
+        create_reviews(admin_client, admin)
+        app.buffer_chunks = 1
+        scope = {
+            'type': 'http', 'method': 'GET',
+            'path': '/api/v1/export/reviews/', 'query_string': b'',
+            'headers': [(b'host', b'testserver'), (
+                b'authorization', f'Bearer {token_admin["access"]}'.encode()
+            )],
+        }
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                raise ConnectionResetError
+
+        async def run():
+            with pytest.raises(ConnectionResetError):
+                await app(scope, receive, send)
+            return await asyncio.wait_for(
+                call(app, 'GET', '/api/v1/titles/'), timeout=10
+            )
+
+        assert asyncio.run(run())[0] == 200, (
+            'Проверьте, что после отключения клиента поток пула '
+            'не остаётся ждать отправки ответа'
+        )
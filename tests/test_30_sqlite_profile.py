@@ -0,0 +1,34 @@
+import pytest
+
+
+class Test30SQLiteProfile:
+
+    @pytest.mark.django_db
+    def test_01_pragmas(self, settings, tmp_path):
+        from django.db import connections
+
+        settings.SQLITE_PRAGMAS = settings.DB_PROFILES['production']['PRAGMAS']
+        connections.databases['tuning'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(tmp_path / 'tuning.sqlite3'),
+        }
+        try:
+            with connections['tuning'].cursor() as cursor:
+                values = {}
+                for name in settings.SQLITE_PRAGMAS:
+                    cursor.execute(f'PRAGMA {name}')
+                    values[name] = cursor.fetchone()[0]
+        finally:
+            connections['tuning'].close()
+            del connections['tuning']
+            del connections.databases['tuning']
+        assert values == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+            'busy_timeout': 20000,
+        }, (
+            'Проверьте, что PRAGMA из SQLITE_PRAGMAS выполняются при '
+            'открытии соединения SQLite'
+        )
@@ -0,0 +1,131 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test31ScoreWriteBehind:
+
+    def reads(self, client, title_id):
+        title = client.get(f'/api/v1/titles/{title_id}/').json()
+        listed = next(
+            item for item in client.get('/api/v1/titles/').json()['results']
+            if item['id'] == title_id
+        )
+        stats = client.get(f'/api/v1/titles/{title_id}/stats/').json()
+        return title, listed, stats
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reads_include_pending(self, admin_client, admin, settings):
+        from reviews.models import Review, ScoreDelta, Title
+
+        settings.SCORE_WRITE_BEHIND = True
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        auth_client(user).patch(f'{url}{reviews[1]["id"]}/', data={'score': 9})
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+
+        stored = Title.objects.get(pk=title_id)
+        assert stored.rating_count == 0 and stored.rating is None, (
+            'Проверьте, что при SCORE_WRITE_BEHIND отзывы не обновляют '
+            'рейтинг произведения сразу'
+        )
+        assert ScoreDelta.objects.filter(title_id=title_id).count() == 6
+
+        title, listed, stats = self.reads(admin_client, title_id)
+        assert title['rating'] == listed['rating'] == 6, (
+            'Проверьте, что рейтинг учитывает ещё не свёрнутые изменения'
+        )
+        latest = Review.objects.filter(title_id=title_id).latest('pub_date')
+        assert title['stats'] == listed['stats'] == stats
+        assert stats['count'] == 2
+        assert stats['histogram']['4'] == stats['histogram']['9'] == 1
+        assert stats['latest_pub_date'] == (
+            latest.pub_date.isoformat().replace('+00:00', 'Z')
+        )
+
+        out = StringIO()
+        call_command('fold_score_deltas', '--once', '--batch-size', '4',
+                     stdout=out)
+        assert 'Свёрнуто изменений: 6' in out.getvalue()
+        assert not ScoreDelta.objects.exists()
+        stored.refresh_from_db()
+        assert (stored.rating_sum, stored.rating_count, stored.rating) == (
+            13, 2, 6
+        ), 'Проверьте, что свёртка переносит изменения в рейтинг'
+        assert self.reads(admin_client, title_id) == (title, listed, stats), (
+            'Проверьте, что после свёртки ответы не меняются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_fold_takes_read_deltas_only(self, settings, monkeypatch):
+        from django.db import connection
+
+        from reviews import services
+        from reviews.models import ScoreDelta, Title
+
+        settings.SCORE_WRITE_BEHIND = True
+        title = Title.objects.create(name='Фильм', year=2000)
+        ScoreDelta.objects.bulk_create([
+            ScoreDelta(pk=10, title=title, score=5, delta=1),
+            ScoreDelta(pk=20, title=title, score=7, delta=1),
+        ])
+        histograms = services.histograms
+
+        def histograms_then_commit(deltas):
+            result = histograms(deltas)
+            if not ScoreDelta.objects.filter(pk=15).exists():
+                # Запись другого процесса с меньшим pk, закоммиченная
+                # после чтения пачки.
+                ScoreDelta.objects.create(
+                    pk=15, title=title, score=9, delta=1
+                )
+            return result
+
+        monkeypatch.setattr(services, 'histograms', histograms_then_commit)
+        statements = []
+
+        def collect(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(collect):
+            folded = services.fold_score_deltas(batch_size=10)
+        assert folded == 3
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (21, 2 + 1), (
+            'Проверьте, что свёртка удаляет только прочитанные изменения, '
+            'а не все с меньшим pk'
+        )
+        first = next(sql for sql in statements
+                     if not sql.startswith(('BEGIN', 'SAVEPOINT')))
+        assert first.startswith('UPDATE'), (
+            'Проверьте, что свёртка берёт блокировку записи до первого '
+            'чтения'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_command_retries(self, settings, monkeypatch):
+        from django.db import OperationalError
+
+        from reviews.management.commands import fold_score_deltas
+
+        calls = []
+
+        def flaky(batch_size):
+            calls.append(batch_size)
+            if len(calls) == 1:
+                raise OperationalError('database is locked')
+            return 2
+
+        monkeypatch.setattr(fold_score_deltas, 'fold_score_deltas', flaky)
+        out = StringIO()
+        call_command('fold_score_deltas', '--once', '--interval', '0',
+                     stdout=out, stderr=StringIO())
+        assert len(calls) == 2 and 'Свёрнуто изменений: 2' in out.getvalue(), (
+            'Проверьте, что `fold_score_deltas` повторяет пачку после '
+            'OperationalError'
+        )